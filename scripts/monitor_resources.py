@@ -4,15 +4,30 @@ Monitor script to watch lit-mux server for file descriptor leaks.
 Run this in parallel with your lit-mux server to monitor resource usage.
 """
 
+import atexit
+import os
 import time
 import subprocess
 import psutil
 import sys
 from datetime import datetime
 
+HEALTH_URL = "http://127.0.0.1:8000/mcp/health"
+
+# Shared HTTP session so repeated health probes reuse one keep-alive connection
+_http_session = None
+
+
+def _is_candidate_comm(comm):
+    """Cheap pre-filter on a process's short command name."""
+    return "lit" in comm or comm.startswith("python") or comm == "uvicorn"
+
 
 def find_lit_mux_process():
     """Find running lit-mux process."""
+    if os.path.isdir("/proc"):
+        return _find_lit_mux_process_proc()
+
     for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
         try:
             cmdline = ' '.join(proc.info['cmdline'] or [])
@@ -23,8 +38,45 @@ def find_lit_mux_process():
     return None
 
 
+def _find_lit_mux_process_proc():
+    """Find running lit-mux process by scanning /proc directly.
+
+    Reads the short /proc/<pid>/comm first and only reads the full
+    cmdline for processes that could plausibly be lit-mux.
+    """
+    own_pid = os.getpid()
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            if not entry.name.isdigit() or int(entry.name) == own_pid:
+                continue
+            try:
+                with open(f"/proc/{entry.name}/comm") as f:
+                    comm = f.read().strip()
+                if not _is_candidate_comm(comm):
+                    continue
+                with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                    cmdline = f.read().replace(b"\0", b" ").decode(errors="replace")
+            except OSError:
+                continue
+            if 'lit-mux' in cmdline or 'lit_mux' in cmdline:
+                return int(entry.name)
+    return None
+
+
 def get_fd_count(pid):
     """Get file descriptor count for a process."""
+    # On Linux a single directory listing of /proc/<pid>/fd counts every
+    # descriptor (files, sockets, pipes) without stat-ing each one the way
+    # psutil's open_files()/connections() do.
+    fd_dir = f"/proc/{pid}/fd"
+    if os.path.isdir("/proc"):
+        try:
+            return len(os.listdir(fd_dir))
+        except FileNotFoundError:
+            return -1
+        except PermissionError:
+            pass
+
     try:
         proc = psutil.Process(pid)
         return len(proc.open_files()) + len(proc.connections())
@@ -137,11 +189,20 @@ def monitor_lit_mux():
                 print("   ✅ NO SIGNIFICANT LEAK")
 
 
+def get_http_session():
+    """Get the shared HTTP session, creating it on first use."""
+    global _http_session
+    if _http_session is None:
+        import requests
+        _http_session = requests.Session()
+        atexit.register(_http_session.close)
+    return _http_session
+
+
 def test_health_endpoint():
     """Test the MCP health endpoint to trigger cleanup."""
     try:
-        import requests
-        response = requests.get("http://127.0.0.1:8000/mcp/health", timeout=5)
+        response = get_http_session().get(HEALTH_URL, timeout=5)
         if response.status_code == 200:
             health_data = response.json()
             print(f"🏥 Health check: {len(health_data.get('servers', {}))} servers")
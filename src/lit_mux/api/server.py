@@ -5,10 +5,16 @@ Includes MCP tool integration and enhanced AI capabilities.
 
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+import asyncio
+import hmac
 import logging
+import time
+import orjson
 from datetime import datetime
+from uuid import UUID
 
 from ..core.session import SessionManager, Session, Message
 from ..core.router import MessageRouter
@@ -18,6 +24,12 @@ from ..services.prompt_composer import PromptComposer
 
 logger = logging.getLogger(__name__)
 
+# Seconds to reuse /models and /backends results before querying backends again
+RESPONSE_CACHE_TTL = 10.0
+
+# Seconds to wait for MCP servers to stop gracefully before killing them
+MCP_SHUTDOWN_TIMEOUT = 5.0
+
 
 # Pydantic models for API requests/responses
 class CreateSessionRequest(BaseModel):
@@ -34,13 +46,38 @@ class SendMessageRequest(BaseModel):
     max_tool_iterations: Optional[int] = Field(20, description="Maximum tool call iterations")
 
 
+class ToolCallRequest(BaseModel):
+    arguments: Dict[str, Any] = Field(default_factory=dict, description="Arguments for the tool")
+
+
 class BroadcastMessageRequest(BaseModel):
     content: str = Field(..., description="Message content to broadcast")
     backends: Optional[List[str]] = Field(None, description="Backends to broadcast to")
 
 
+class MCPServerRequest(BaseModel):
+    name: str = Field(..., description="Server name")
+    command: str = Field(..., description="Command that starts the server")
+    args: List[str] = Field(default_factory=list)
+    env: Dict[str, str] = Field(default_factory=dict)
+    timeout: int = Field(10, description="Request timeout in seconds")
+
+
+class MCPCycleOp(BaseModel):
+    add: Optional[MCPServerRequest] = Field(None, description="Server to add")
+    remove: Optional[str] = Field(None, description="Name of a server to remove")
+    health: bool = Field(False, description="Report MCP health")
+    fields: Optional[str] = Field(None, description="Comma-separated health fields to report")
+
+
+class MCPCycleRequest(BaseModel):
+    ops: List[MCPCycleOp] = Field(..., description="Operations to run, in order")
+
+
+# Response models are filled from our own Session/Message objects, so the
+# handlers build them with model_construct() and skip re-validation.
 class MessageResponse(BaseModel):
-    id: str
+    id: UUID
     content: str
     role: str
     backend: str
@@ -50,7 +87,7 @@ class MessageResponse(BaseModel):
 
 
 class SessionResponse(BaseModel):
-    id: str
+    id: UUID
     name: Optional[str]
     backends: List[str]
     created_at: datetime
@@ -71,11 +108,13 @@ class LitMuxAPI:
     def __init__(self):
         from ..core.config import load_config
         self.config = load_config()
+        self._api_key_bytes = (self.config.server.api_key or "").encode()
         
         self.app = FastAPI(
             title="LIT Mux API",
             description="Multi-AI multiplexer REST API with MCP tool integration",
-            version="0.1.0"
+            version="0.1.0",
+            default_response_class=ORJSONResponse
         )
         
         # Add CORS middleware
@@ -88,13 +127,24 @@ class LitMuxAPI:
         )
         
         # Initialize core components
-        self.session_manager = SessionManager()
+        self.session_manager = SessionManager(
+            max_sessions=self.config.sessions.max_sessions,
+            max_messages=self.config.sessions.max_messages,
+            ttl_seconds=self.config.sessions.ttl_seconds
+        )
         self.message_router = MessageRouter()
         
         # Initialize MCP client and tool processing
         self.mcp_client = MCPClient()
         self.prompt_composer = PromptComposer()
         
+        # (monotonic timestamp, payload) for the read-only aggregate endpoints
+        self._models_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._backends_cache: Optional[Tuple[float, List[BackendStatus]]] = None
+        
+        # In-progress MCP shutdown, shared by concurrent shutdown_mcp() callers
+        self._mcp_shutdown_task: Optional[asyncio.Task] = None
+        
         # Setup routes
         self._setup_routes()
     
@@ -103,21 +153,126 @@ class LitMuxAPI:
         if not self.config.server.api_key:
             return True  # No auth required if no key configured
             
-        api_key = request.headers.get("X-API-Key") or request.headers.get("Authorization", "").replace("Bearer ", "")
-        if api_key != self.config.server.api_key:
+        api_key = request.headers.get("X-API-Key")
+        if not api_key:
+            authorization = request.headers.get("Authorization", "")
+            if authorization.startswith("Bearer "):
+                api_key = authorization[7:]
+        # Constant-time comparison so response timing doesn't leak the key
+        if not api_key or not hmac.compare_digest(api_key.encode(), self._api_key_bytes):
             raise HTTPException(status_code=401, detail="Invalid or missing API key")
         return True
     
     async def initialize_mcp(self, server_configs: List[MCPServerConfig] = None):
         """Initialize MCP servers. Called by the main server setup."""
         if server_configs:
-            for config in server_configs:
-                await self.mcp_client.add_server(config)
-                logger.info(f"Added MCP server: {config.name}")
+            results = await self.mcp_client.add_servers(server_configs)
+            for config, added in zip(server_configs, results):
+                if added:
+                    logger.info("Added MCP server: %s", config.name)
+    
+    async def _mcp_health(self) -> Dict[str, Any]:
+        """MCP health report; dead servers found along the way are removed."""
+        health_info = await self.mcp_client.health_check()
+        
+        # Check for dead servers and clean them up
+        servers_info = health_info.get("servers", {})
+        dead_servers = []
+        for server_name, info in list(servers_info.items()):
+            if not info.get("running", False):
+                server = self.mcp_client.servers.get(server_name)
+                if server and server.process and not server.is_alive():
+                    logger.warning("Detected dead server %s, cleaning up", server_name)
+                    await self.mcp_client.remove_server(server_name)
+                    servers_info.pop(server_name, None)
+                    dead_servers.append(server_name)
+        
+        if dead_servers:
+            # Reflect the cleanup in the report we already have
+            health_info["total_tools"] = len(self.mcp_client.tools)
+            health_info["statistics"] = self.mcp_client.stats.copy()
+            health_info["cleaned_up"] = dead_servers
+        
+        return health_info
+    
+    @staticmethod
+    def _select_health_fields(health_info: Dict[str, Any], fields: str) -> Dict[str, Any]:
+        """Compact health report with only the requested fields; servers_count stands in for servers."""
+        summary = {}
+        for field in fields.split(","):
+            field = field.strip()
+            if field == "servers_count":
+                summary[field] = len(health_info.get("servers", {}))
+            elif field in health_info:
+                summary[field] = health_info[field]
+        return summary
     
     async def shutdown_mcp(self):
-        """Shutdown MCP servers."""
-        await self.mcp_client.shutdown()
+        """Shutdown MCP servers.
+        
+        Concurrent callers (the signal handler and the shutdown event) wait
+        on the same shutdown rather than stopping each server twice.
+        """
+        if self._mcp_shutdown_task is None or self._mcp_shutdown_task.done():
+            self._mcp_shutdown_task = asyncio.ensure_future(self._shutdown_mcp())
+        await asyncio.shield(self._mcp_shutdown_task)
+    
+    async def _shutdown_mcp(self):
+        """Stop MCP servers gracefully, killing them if that takes too long."""
+        try:
+            await asyncio.wait_for(self.mcp_client.shutdown(), timeout=MCP_SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("MCP shutdown timed out after %ss, force killing servers", MCP_SHUTDOWN_TIMEOUT)
+            await self.mcp_client.force_shutdown()
+        finally:
+            self.invalidate_response_cache()
+    
+    def invalidate_response_cache(self):
+        """Drop cached /models and /backends results."""
+        self._models_cache = None
+        self._backends_cache = None
+    
+    async def _process_with_tools(
+        self,
+        request: SendMessageRequest,
+        backend_instance,
+        model: str,
+        available_tools: list,
+        messages
+    ) -> str:
+        """Answer a message through the tool-calling loop and return the final content."""
+        logger.info("Processing message with tools enabled using model %s", model)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Available tools: %s", [t.name for t in available_tools])
+        
+        # Initialize tool processor
+        tool_processor = ToolCallProcessor(self.mcp_client, backend_instance)
+        
+        # Compose system prompt with tools
+        prompt_info = self.prompt_composer.compose_system_prompt(
+            request.content,
+            available_tools,
+            messages
+        )
+        
+        logger.info("System prompt composed: %d chars", len(prompt_info['system_prompt']))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("System prompt preview: %s...", prompt_info['system_prompt'][:500])
+        
+        # Add system prompt to messages
+        enhanced_messages = [
+            {"role": "system", "content": prompt_info["system_prompt"]},
+            *messages
+        ]
+        
+        # Process with tools
+        return await tool_processor.process_with_tools(
+            model=model,
+            messages=enhanced_messages,
+            tools=[],  # Tools are in system prompt
+            max_iterations=request.max_tool_iterations,
+            system_prompt_info=prompt_info
+        )
     
     def _setup_routes(self):
         """Setup API routes."""
@@ -131,7 +286,7 @@ class LitMuxAPI:
         async def create_session(request: CreateSessionRequest, auth=Depends(self._check_auth)):
             """Create a new AI session."""
             # Validate backends exist
-            available_backends = self.message_router.list_backends()
+            available_backends = self.message_router.list_backends_set()
             invalid_backends = [b for b in request.backends if b not in available_backends]
             if invalid_backends:
                 raise HTTPException(
@@ -145,14 +300,14 @@ class LitMuxAPI:
                 metadata=request.metadata
             )
             
-            return SessionResponse(
+            return SessionResponse.model_construct(
                 id=session.id,
                 name=session.name,
                 backends=session.backends,
-                created_at=session.created_at,
-                updated_at=session.updated_at,
+                created_at=session.created_at_dt,
+                updated_at=session.updated_at_dt,
                 metadata=session.metadata,
-                message_count=len(session.messages)
+                message_count=session.message_count
             )
         
         @self.app.get("/sessions", response_model=List[SessionResponse])
@@ -160,14 +315,14 @@ class LitMuxAPI:
             """List all sessions."""
             sessions = await self.session_manager.list_sessions()
             return [
-                SessionResponse(
+                SessionResponse.model_construct(
                     id=session.id,
                     name=session.name,
                     backends=session.backends,
-                    created_at=session.created_at,
-                    updated_at=session.updated_at,
+                    created_at=session.created_at_dt,
+                    updated_at=session.updated_at_dt,
                     metadata=session.metadata,
-                    message_count=len(session.messages)
+                    message_count=session.message_count
                 )
                 for session in sessions
             ]
@@ -179,14 +334,14 @@ class LitMuxAPI:
             if not session:
                 raise HTTPException(status_code=404, detail="Session not found")
             
-            return SessionResponse(
+            return SessionResponse.model_construct(
                 id=session.id,
                 name=session.name,
                 backends=session.backends,
-                created_at=session.created_at,
-                updated_at=session.updated_at,
+                created_at=session.created_at_dt,
+                updated_at=session.updated_at_dt,
                 metadata=session.metadata,
-                message_count=len(session.messages)
+                message_count=session.message_count
             )
         
         @self.app.delete("/sessions/{session_id}")
@@ -204,18 +359,19 @@ class LitMuxAPI:
             if not session:
                 raise HTTPException(status_code=404, detail="Session not found")
             
-            return [
-                MessageResponse(
-                    id=msg.id,
-                    content=msg.content,
-                    role=msg.role,
-                    backend=msg.backend,
-                    model=msg.metadata.get("model"),
-                    timestamp=msg.timestamp,
-                    metadata=msg.metadata
-                )
+            # Serialize plain dicts in one pass; response_model still documents the schema
+            return ORJSONResponse([
+                {
+                    "id": msg.id,
+                    "content": msg.content,
+                    "role": msg.role,
+                    "backend": msg.backend,
+                    "model": msg.metadata.get("model"),
+                    "timestamp": msg.timestamp_dt,
+                    "metadata": msg.metadata
+                }
                 for msg in session.messages
-            ]
+            ])
         
         @self.app.post("/sessions/{session_id}/message", response_model=MessageResponse)
         async def send_message(session_id: str, request: SendMessageRequest, auth=Depends(self._check_auth)):
@@ -226,7 +382,7 @@ class LitMuxAPI:
             
             # Determine backend to use
             backend = request.backend or session.backends[0]
-            if backend not in session.backends:
+            if backend not in session.backend_set:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Backend {backend} not available in this session"
@@ -238,12 +394,8 @@ class LitMuxAPI:
             )
             
             # Get session message history for context
-            messages = []
-            for msg in session.messages[-10:]:  # Last 10 messages for context
-                messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
+            # Read-only view of the session's bounded context window (no copy)
+            messages = session.context_window
             
             # Get backend instance
             backend_instance = self.message_router.get_backend(backend)
@@ -257,48 +409,21 @@ class LitMuxAPI:
             model = request.model or backend_instance.default_model
             
             # Check if we should use tools
-            use_tools = request.use_tools and bool(self.mcp_client.get_available_tools())
+            available_tools = self.mcp_client.get_available_tools()
+            use_tools = request.use_tools and bool(available_tools)
             
             if use_tools:
                 # Use tool-enhanced processing
-                available_tools = self.mcp_client.get_available_tools()
-                logger.info(f"Processing message with tools enabled using model {model}")
-                logger.info(f"Available tools: {[t.name for t in available_tools]}")
-                
-                # Initialize tool processor
-                tool_processor = ToolCallProcessor(self.mcp_client, backend_instance)
-                
-                # Compose system prompt with tools
-                prompt_info = self.prompt_composer.compose_system_prompt(
-                    request.content,
-                    available_tools,
-                    messages
+                response_content = await self._process_with_tools(
+                    request, backend_instance, model, available_tools, messages
                 )
-                
-                logger.info(f"System prompt composed: {len(prompt_info['system_prompt'])} chars")
-                logger.info(f"System prompt preview: {prompt_info['system_prompt'][:500]}...")
-                
-                # Add system prompt to messages
-                enhanced_messages = [
-                    {"role": "system", "content": prompt_info["system_prompt"]}
-                ] + messages
-                
-                # Process with tools
-                response_content = await tool_processor.process_with_tools(
-                    model=model,
-                    messages=enhanced_messages,
-                    tools=[],  # Tools are in system prompt
-                    max_iterations=request.max_tool_iterations,
-                    system_prompt_info=prompt_info
-                )
-                
                 response_model = model
                 
             else:
                 # Standard processing without tools
                 if request.use_tools:
-                    logger.warning(f"Tools requested but no tools available. Available: {len(self.mcp_client.get_available_tools())}")
-                logger.info(f"Processing message without tools using model {model}")
+                    logger.warning("Tools requested but no tools available. Available: %d", len(available_tools))
+                logger.info("Processing message without tools using model %s", model)
                 
                 kwargs = {
                     "session_metadata": session.metadata
@@ -317,8 +442,8 @@ class LitMuxAPI:
                     )
                 
                 # Extract content and model from response
-                response_content = response.get("content", "")
-                response_model = response.get("model")
+                response_content = response.content
+                response_model = response.model
             
             # Add AI response to session with model info
             ai_msg_metadata = {"model": response_model} if response_model else {}
@@ -326,16 +451,93 @@ class LitMuxAPI:
                 session_id, response_content, "assistant", backend, ai_msg_metadata
             )
             
-            return MessageResponse(
+            return MessageResponse.model_construct(
                 id=ai_msg.id,
                 content=ai_msg.content,
                 role=ai_msg.role,
                 backend=ai_msg.backend,
                 model=response_model,
-                timestamp=ai_msg.timestamp,
+                timestamp=ai_msg.timestamp_dt,
                 metadata=ai_msg.metadata
             )
         
+        @self.app.post("/sessions/{session_id}/message/stream")
+        async def stream_message(session_id: str, request: SendMessageRequest, auth=Depends(self._check_auth)):
+            """Send a message to a session and stream the reply as plain text.
+            
+            Tool-enabled replies are produced by the full tool loop and sent as one chunk.
+            A backend failure aborts the response and nothing is saved.
+            """
+            session = await self.session_manager.get_session(session_id)
+            if not session:
+                raise HTTPException(status_code=404, detail="Session not found")
+            
+            backend = request.backend or session.backends[0]
+            if backend not in session.backend_set:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Backend {backend} not available in this session"
+                )
+            
+            backend_instance = self.message_router.get_backend(backend)
+            if not backend_instance or not backend_instance.enabled:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Backend {backend} not available"
+                )
+            
+            await self.session_manager.add_message_to_session(
+                session_id, request.content, "user", "client"
+            )
+            messages = session.context_window
+            model = request.model or backend_instance.default_model
+            available_tools = self.mcp_client.get_available_tools()
+            use_tools = request.use_tools and bool(available_tools)
+            
+            kwargs = {"session_metadata": session.metadata}
+            if request.model:
+                kwargs["model"] = request.model
+            # Record the model the backend will actually use, as /message does
+            response_model = model if use_tools else backend_instance.resolve_model(kwargs)
+            
+            async def generate():
+                parts = []
+                failed = False
+                try:
+                    if use_tools:
+                        content = await self._process_with_tools(
+                            request, backend_instance, model, available_tools, messages
+                        )
+                        parts.append(content)
+                        yield content
+                    else:
+                        async for chunk in backend_instance.stream_message(
+                            request.content, context=[], **kwargs
+                        ):
+                            parts.append(chunk)
+                            yield chunk
+                except Exception as e:
+                    # The 200 status is already sent; abort the response so the
+                    # client sees a broken stream rather than a short reply
+                    failed = True
+                    logger.error("Streaming from %s failed: %s", backend, e)
+                    raise
+                finally:
+                    # Record whatever was sent, even if the client went away
+                    # mid-stream, but never a reply cut short by a backend error
+                    if parts and not failed:
+                        await self.session_manager.add_message_to_session(
+                            session_id, "".join(parts), "assistant", backend,
+                            {"model": response_model} if response_model else {}
+                        )
+            
+            # X-Accel-Buffering stops nginx-style proxies from holding the stream back
+            return StreamingResponse(
+                generate(),
+                media_type="text/plain; charset=utf-8",
+                headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"}
+            )
+        
         @self.app.post("/sessions/{session_id}/broadcast")
         async def broadcast_message(session_id: str, request: BroadcastMessageRequest, auth=Depends(self._check_auth)):
             """Broadcast message to multiple backends."""
@@ -345,7 +547,7 @@ class LitMuxAPI:
             
             # Determine backends to use
             backends = request.backends or session.backends
-            invalid_backends = [b for b in backends if b not in session.backends]
+            invalid_backends = [b for b in backends if b not in session.backend_set]
             if invalid_backends:
                 raise HTTPException(
                     status_code=400,
@@ -362,23 +564,40 @@ class LitMuxAPI:
                 backends, request.content, context=[]
             )
             
-            # Add all responses to session
+            # Add all successful responses to session in one batch
+            answered = [
+                (backend, response) for backend, response in responses.items()
+                if response is not None
+            ]
+            ai_msgs = await asyncio.gather(*(
+                self.session_manager.add_message_to_session(
+                    session_id,
+                    response.content,
+                    "assistant",
+                    backend,
+                    {"model": response.model} if response.model else {}
+                )
+                for backend, response in answered
+            ))
+            messages_by_backend = {
+                backend: ai_msg for (backend, _), ai_msg in zip(answered, ai_msgs)
+            }
+            
             results = []
-            for backend, response in responses.items():
-                if response is not None:
-                    ai_msg = await self.session_manager.add_message_to_session(
-                        session_id, response, "assistant", backend
-                    )
+            for backend in responses:
+                ai_msg = messages_by_backend.get(backend)
+                if ai_msg is not None:
                     results.append({
                         "backend": backend,
-                        "message": MessageResponse(
-                            id=ai_msg.id,
-                            content=ai_msg.content,
-                            role=ai_msg.role,
-                            backend=ai_msg.backend,
-                            timestamp=ai_msg.timestamp,
-                            metadata=ai_msg.metadata
-                        )
+                        "message": {
+                            "id": ai_msg.id,
+                            "content": ai_msg.content,
+                            "role": ai_msg.role,
+                            "backend": ai_msg.backend,
+                            "model": ai_msg.metadata.get("model"),
+                            "timestamp": ai_msg.timestamp_dt,
+                            "metadata": ai_msg.metadata
+                        }
                     })
                 else:
                     results.append({
@@ -391,10 +610,13 @@ class LitMuxAPI:
         @self.app.get("/backends", response_model=List[BackendStatus])
         async def list_backends(auth=Depends(self._check_auth)):
             """List all available backends."""
+            if self._backends_cache and time.monotonic() - self._backends_cache[0] < RESPONSE_CACHE_TTL:
+                return self._backends_cache[1]
+            
             backend_names = self.message_router.list_backends()
             health_status = await self.message_router.health_check_all()
             
-            return [
+            backends = [
                 BackendStatus(
                     name=name,
                     enabled=self.message_router.get_backend(name).enabled,
@@ -402,6 +624,8 @@ class LitMuxAPI:
                 )
                 for name in backend_names
             ]
+            self._backends_cache = (time.monotonic(), backends)
+            return backends
         
         @self.app.get("/tools")
         async def list_mcp_tools(auth=Depends(self._check_auth)):
@@ -420,55 +644,118 @@ class LitMuxAPI:
                 "total": len(tools)
             }
         
+        @self.app.post("/tools/{server_name}/{tool_name}/stream")
+        async def stream_mcp_tool(
+            server_name: str,
+            tool_name: str,
+            request: ToolCallRequest,
+            auth=Depends(self._check_auth)
+        ):
+            """Run an MCP tool and stream its progress and result items as NDJSON."""
+            tools = self.mcp_client.get_tools_by_server(server_name)
+            if not any(tool.name == tool_name for tool in tools):
+                raise HTTPException(status_code=404, detail=f"Tool {server_name}.{tool_name} not found")
+            
+            async def generate():
+                try:
+                    async for item in self.mcp_client.execute_tool_stream(
+                        server_name, tool_name, request.arguments
+                    ):
+                        yield orjson.dumps(item) + b"\n"
+                except Exception as e:
+                    logger.error("Streaming tool %s.%s failed: %s", server_name, tool_name, e)
+                    yield orjson.dumps({"type": "error", "message": str(e)}) + b"\n"
+            
+            return StreamingResponse(
+                generate(),
+                media_type="application/x-ndjson",
+                headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"}
+            )
+        
         @self.app.get("/mcp/health")
-        async def mcp_health_check(auth=Depends(self._check_auth)):
-            """Check MCP server health status and clean up dead servers."""
-            health_info = await self.mcp_client.health_check()
-            
-            # Check for dead servers and clean them up
-            dead_servers = []
-            for server_name, info in health_info.get("servers", {}).items():
-                if not info.get("running", False):
-                    server = self.mcp_client.servers.get(server_name)
-                    if server and server.process and server.process.poll() is not None:
-                        logger.warning(f"Detected dead server {server_name}, cleaning up")
-                        await self.mcp_client.remove_server(server_name)
-                        dead_servers.append(server_name)
-            
-            if dead_servers:
-                # Refresh health info after cleanup
-                health_info = await self.mcp_client.health_check()
-                health_info["cleaned_up"] = dead_servers
+        async def mcp_health_check(fields: Optional[str] = None, auth=Depends(self._check_auth)):
+            """Check MCP server health status and clean up dead servers.
             
+            ?fields=servers_count,total_tools returns just those fields.
+            """
+            health_info = await self._mcp_health()
+            if fields:
+                return self._select_health_fields(health_info, fields)
             return health_info
         
+        @self.app.post("/mcp/cycle")
+        async def mcp_cycle(request: MCPCycleRequest, auth=Depends(self._check_auth)):
+            """Run a batch of MCP add/remove/health operations in order, in one round trip."""
+            # Reject a malformed batch before any of it runs
+            if any(op.add is None and op.remove is None and not op.health for op in request.ops):
+                raise HTTPException(status_code=400, detail="Each op needs add, remove or health")
+            
+            # An add runs a client-supplied command on this host, so it needs an
+            # explicit opt-in and an API key; otherwise any web page could run one
+            if any(op.add is not None for op in request.ops) and not (
+                self.config.mcp.allow_runtime_servers and self.config.server.api_key
+            ):
+                raise HTTPException(
+                    status_code=403,
+                    detail="Adding MCP servers needs mcp.allow_runtime_servers and server.api_key"
+                )
+            
+            results = []
+            for op in request.ops:
+                if op.add is not None:
+                    config = MCPServerConfig(
+                        op.add.name, op.add.command, op.add.args, op.add.env, op.add.timeout
+                    )
+                    success = await self.mcp_client.add_server(config)
+                    results.append({"op": "add", "name": op.add.name, "success": success})
+                elif op.remove is not None:
+                    success = await self.mcp_client.remove_server(op.remove)
+                    results.append({"op": "remove", "name": op.remove, "success": success})
+                else:
+                    health_info = await self._mcp_health()
+                    if op.fields:
+                        health_info = self._select_health_fields(health_info, op.fields)
+                    results.append({"op": "health", "health": health_info})
+            return {"results": results}
+        
         @self.app.get("/models")
         async def list_models(auth=Depends(self._check_auth)):
             """Get available models from all backends."""
+            if self._models_cache and time.monotonic() - self._models_cache[0] < RESPONSE_CACHE_TTL:
+                return self._models_cache[1]
+            
             models = {}
             
-            # Get models from each backend
+            # Fetch models from all backends concurrently
+            model_backends = []
             for backend_name in self.message_router.list_backends():
                 backend = self.message_router.get_backend(backend_name)
+                models[backend_name] = []
                 if hasattr(backend, 'get_models'):
-                    try:
-                        backend_models = await backend.get_models()
-                        models[backend_name] = [
-                            {
-                                "name": model.name,
-                                "display_name": model.display_name,
-                                "size_mb": round(model.size_mb, 1) if hasattr(model, 'size_mb') else None,
-                                "digest": getattr(model, 'digest', None)
-                            }
-                            for model in backend_models
-                        ]
-                    except Exception as e:
-                        logger.error(f"Failed to get models from {backend_name}: {e}")
-                        models[backend_name] = []
-                else:
-                    models[backend_name] = []
+                    model_backends.append((backend_name, backend))
             
-            return {
+            results = await asyncio.gather(
+                *(backend.get_models() for _, backend in model_backends),
+                return_exceptions=True
+            )
+            
+            for (backend_name, _), backend_models in zip(model_backends, results):
+                if isinstance(backend_models, Exception):
+                    logger.error("Failed to get models from %s: %s", backend_name, backend_models)
+                    continue
+                models[backend_name] = [
+                    {
+                        "name": model.name,
+                        "display_name": model.display_name,
+                        "size_mb": round(model.size_mb, 1) if hasattr(model, 'size_mb') else None,
+                        "digest": getattr(model, 'digest', None)
+                    }
+                    for model in backend_models
+                ]
+            
+            payload = {
                 "models": models,
                 "total": sum(len(backend_models) for backend_models in models.values())
             }
+            self._models_cache = (time.monotonic(), payload)
+            return payload
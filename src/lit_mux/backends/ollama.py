@@ -6,39 +6,106 @@ Now includes MCP tool integration for enhanced AI capabilities.
 
 import asyncio
 import logging
+import time
 from typing import AsyncIterator, Dict, List, Optional, Any, Callable
 
+import httpx
 import ollama
 from ollama import AsyncClient
 
-from ..core.router import Backend
+from ..core.router import Backend, BackendResponse
 
 
 logger = logging.getLogger(__name__)
 
+# Connection pool for the shared Ollama HTTP client. Generation can take
+# minutes, so only the connect phase gets a short timeout.
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=40,
+    max_connections=100,
+    keepalive_expiry=30.0
+)
+HTTP_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+
+
+# Upper bound (in characters) for tokens merged into one streamed chunk
+STREAM_COALESCE_SIZE = 4096
+
+_STREAM_END = object()
+
+
+async def _coalesce_chunks(
+    chunks: AsyncIterator[str],
+    max_size: int = STREAM_COALESCE_SIZE
+) -> AsyncIterator[str]:
+    """Merge chunks that are already waiting into a single yield.
+    
+    A background task drains the source into a queue. Each yield takes the
+    next chunk plus whatever else has arrived in the meantime, up to
+    max_size characters, without waiting for more.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def pump() -> None:
+        try:
+            async for chunk in chunks:
+                queue.put_nowait(chunk)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(_STREAM_END)
+    
+    pump_task = asyncio.ensure_future(pump())
+    try:
+        finished = False
+        while not finished:
+            item = await queue.get()
+            if item is _STREAM_END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            
+            buffer = [item]
+            size = len(item)
+            while size < max_size and not queue.empty():
+                item = queue.get_nowait()
+                if item is _STREAM_END:
+                    finished = True
+                    break
+                if isinstance(item, Exception):
+                    yield "".join(buffer)
+                    raise item
+                buffer.append(item)
+                size += len(item)
+            yield "".join(buffer)
+    finally:
+        pump_task.cancel()
+
 
 class OllamaModel:
     """Represents an Ollama model."""
     
+    __slots__ = ("name", "size", "digest", "details", "_display_name", "_size_mb")
+    
     def __init__(self, name: str, size: int = 0, digest: str = "", details: Optional[Dict] = None):
         self.name = name
         self.size = size
         self.digest = digest
         self.details = details or {}
+        # Derived display values are computed once; strip the :latest suffix
+        # for cleaner display and capitalize the first letter
+        self._display_name = name.replace(":latest", "").capitalize()
+        self._size_mb = size / (1024 * 1024)
         
     @property
     def display_name(self) -> str:
         """Get a user-friendly display name."""
-        # Remove :latest suffix for cleaner display
-        name = self.name.replace(":latest", "")
-        
-        # Capitalize first letter
-        return name.capitalize()
+        return self._display_name
     
     @property
     def size_mb(self) -> float:
         """Get model size in MB."""
-        return self.size / (1024 * 1024)
+        return self._size_mb
     
     def __str__(self) -> str:
         return f"{self.display_name} ({self.size_mb:.1f}MB)"
@@ -51,36 +118,37 @@ class OllamaBackend(Backend):
         super().__init__("ollama")
         self.host = host
         self.default_model = default_model
-        self.client = AsyncClient(host=host)
+        # One pooled client per backend so requests reuse keep-alive connections
+        self.client = AsyncClient(host=host, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
         self._models_cache: Optional[List[OllamaModel]] = None
         self._cache_time: Optional[float] = None
+        # Single-flight guard so concurrent cache misses fetch the list once
+        self._models_lock = asyncio.Lock()
         
-    async def send_message(self, content: str, context: List[Dict[str, Any]] = None, **kwargs) -> str:
-        """Send message to Ollama and return response."""
-        # Build messages from context
-        messages = []
-        if context:
-            for msg in context:
-                messages.append({
-                    "role": msg.get("role", "user"),
-                    "content": msg.get("content", "")
-                })
-        
-        # Add current message
-        messages.append({
-            "role": "user", 
-            "content": content
-        })
-        
-        # Determine model to use (priority: message > session > backend config > default)
-        model = (
+    def _build_messages(self, content: str, context: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Build the Ollama chat message list from context plus the new user message."""
+        messages = [
+            {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+            for msg in context or ()
+        ]
+        messages.append({"role": "user", "content": content})
+        return messages
+    
+    def resolve_model(self, kwargs: Dict[str, Any]) -> str:
+        """Pick the model for a message (priority: message > session > backend config > default)."""
+        return (
             kwargs.get("model") or  # Per-message model
             kwargs.get("session_metadata", {}).get("ollama_model") or  # Per-session model
             self.config.get("model") or  # Backend config model
             self.default_model  # Default fallback
         )
+    
+    async def send_message(self, content: str, context: List[Dict[str, Any]] = None, **kwargs) -> Optional[BackendResponse]:
+        """Send message to Ollama and return response."""
+        messages = self._build_messages(content, context)
+        model = self.resolve_model(kwargs)
         
-        logger.debug(f"Using ollama model: {model}")
+        logger.debug("Using ollama model: %s", model)
         
         try:
             response = await self.client.chat(
@@ -91,36 +159,63 @@ class OllamaBackend(Backend):
             
             if 'message' in response and 'content' in response['message']:
                 # Return both content and metadata about the model used
-                return {
-                    "content": response['message']['content'],
-                    "model": model
-                }
+                return BackendResponse(
+                    content=response['message']['content'],
+                    model=model
+                )
             else:
                 return None
                 
         except Exception as e:
-            logger.error(f"Ollama chat completion failed with model {model}: {e}")
+            logger.error("Ollama chat completion failed with model %s: %s", model, e)
             return None
     
+    async def warmup(self) -> None:
+        """Open a keep-alive connection to Ollama before the first chat request."""
+        try:
+            await self.client.list()
+        except Exception as e:
+            logger.debug("Ollama warmup failed: %s", e)
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections to Ollama."""
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            await close()
+        else:
+            # Older ollama releases have no close(); shut the httpx client directly
+            await self.client._client.aclose()
+    
     async def health_check(self) -> bool:
         """Check if Ollama is running and responsive."""
         try:
             await self.client.list()
             return True
         except Exception as e:
-            logger.debug(f"Ollama health check failed: {e}")
+            logger.debug("Ollama health check failed: %s", e)
             return False
     
     async def get_models(self, force_refresh: bool = False) -> List[OllamaModel]:
         """Get list of available models."""
-        # Use cache if recent (within 30 seconds)
-        current_time = asyncio.get_event_loop().time()
-        if (not force_refresh and 
-            self._models_cache is not None and 
-            self._cache_time is not None and 
-            current_time - self._cache_time < 30):
+        if not force_refresh and self._models_cache_fresh():
             return self._models_cache
         
+        async with self._models_lock:
+            # Another caller may have refreshed the cache while we waited
+            if not force_refresh and self._models_cache_fresh():
+                return self._models_cache
+            return await self._fetch_models()
+    
+    def _models_cache_fresh(self) -> bool:
+        """Check whether the cached model list is recent (within 30 seconds)."""
+        return (
+            self._models_cache is not None and
+            self._cache_time is not None and
+            time.monotonic() - self._cache_time < 30
+        )
+    
+    async def _fetch_models(self) -> List[OllamaModel]:
+        """Fetch the model list from Ollama and refresh the cache."""
         try:
             response = await self.client.list()
             models = []
@@ -130,7 +225,7 @@ class OllamaBackend(Backend):
                 model_name = model_data.get('model') or model_data.get('name', '')
                 
                 if not model_name:
-                    logger.warning(f"Model data missing name: {model_data}")
+                    logger.warning("Model data missing name: %s", model_data)
                     continue
                 
                 model = OllamaModel(
@@ -143,37 +238,48 @@ class OllamaBackend(Backend):
             
             # Cache the results
             self._models_cache = models
-            self._cache_time = current_time
+            self._cache_time = time.monotonic()
             
-            logger.info(f"Found {len(models)} Ollama models")
+            logger.info("Found %d Ollama models", len(models))
             return models
             
         except Exception as e:
-            logger.error(f"Failed to fetch models: {e}")
+            logger.error("Failed to fetch models: %s", e)
             return []
     
+    async def stream_message(self, content: str, context: List[Dict[str, Any]] = None, **kwargs) -> AsyncIterator[str]:
+        """Stream the response to a message as coalesced text chunks."""
+        chunks = self._stream_tokens(content, context, model=self.resolve_model(kwargs))
+        async for text in _coalesce_chunks(chunks):
+            yield text
+    
     async def stream_chat(
         self,
         content: str,
         context: List[Dict[str, Any]] = None
     ) -> AsyncIterator[str]:
-        """Stream chat completion (for future streaming API support)."""
-        # Build messages from context
-        messages = []
-        if context:
-            for msg in context:
-                messages.append({
-                    "role": msg.get("role", "user"),
-                    "content": msg.get("content", "")
-                })
+        """Stream chat completion (for future streaming API support).
         
-        # Add current message
-        messages.append({
-            "role": "user", 
-            "content": content
-        })
+        Tokens that arrive while the consumer is busy are merged into the
+        next yielded chunk, so slow consumers see fewer, larger chunks.
+        """
+        async for text in _coalesce_chunks(self._stream_tokens(content, context)):
+            yield text
+    
+    async def _stream_tokens(
+        self,
+        content: str,
+        context: List[Dict[str, Any]] = None,
+        model: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Yield raw token chunks from Ollama for stream_chat and stream_message.
+        
+        Failures are raised, never yielded as text, so callers can tell an
+        error apart from the model's reply.
+        """
+        messages = self._build_messages(content, context)
         
-        model = self.config.get("model", self.default_model)
+        model = model or self.config.get("model", self.default_model)
         
         try:
             async for chunk in await self.client.chat(
@@ -187,41 +293,57 @@ class OllamaBackend(Backend):
                         yield content
                         
         except Exception as e:
-            logger.error(f"Streaming chat failed: {e}")
-            yield f"\nError: {e}"
+            logger.error("Streaming chat failed: %s", e)
+            raise
 
     async def chat_completion(
         self,
         model: str,
         messages: List[Dict[str, Any]],
-        stream: bool = False,
+        stream: bool = True,
         options: Optional[Dict[str, Any]] = None
     ) -> AsyncIterator[str]:
         """
         Chat completion method compatible with tool processor.
         This method is used by the ToolCallProcessor.
+        
+        Always makes a single streaming request to Ollama. With stream=True
+        (the default) tokens are yielded as they are generated; with
+        stream=False they are joined and yielded once, as one chunk.
         """
+        if not stream:
+            chunks = [
+                chunk async for chunk in self.chat_completion(model, messages, options=options)
+            ]
+            if chunks:
+                yield "".join(chunks)
+            return
+        
         try:
             # Use the configured Ollama client
-            response = await self.client.chat(
+            async for chunk in await self.client.chat(
                 model=model,
                 messages=messages,
-                stream=stream,
+                stream=True,
                 options=options or {}
-            )
-            
-            if stream:
-                # For streaming, yield content as it comes
-                async for chunk in response:
-                    if 'message' in chunk and 'content' in chunk['message']:
-                        content = chunk['message']['content']
-                        if content:
-                            yield content
-            else:
-                # For non-streaming, return the full response
-                if 'message' in response and 'content' in response['message']:
-                    yield response['message']['content']
+            ):
+                if 'message' in chunk and 'content' in chunk['message']:
+                    content = chunk['message']['content']
+                    if content:
+                        yield content
                     
         except Exception as e:
-            logger.error(f"Chat completion failed: {e}")
+            logger.error("Chat completion failed: %s", e)
             yield f"Error: {e}"
+    
+    async def chat_once(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Run a chat completion and return the full reply as one string."""
+        chunks = [
+            chunk async for chunk in self.chat_completion(model, messages, options=options)
+        ]
+        return "".join(chunks)
@@ -11,13 +11,48 @@ import sys
 
 from .api.server import LitMuxAPI
 from .core.config import Config, load_config, create_default_config
+from .core.event_loop import select_event_loop, select_http_protocol
+
+# Read size for streamed replies; chunks are printed as soon as they arrive
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Shared HTTP session for talking to a running server; created on first use
+_http_session = None
+
+
+def get_http_session():
+    """Get a keep-alive HTTP session for requests to the lit-mux server."""
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        _http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+        _http_session.mount("http://", adapter)
+        _http_session.mount("https://", adapter)
+        _http_session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip, deflate",
+        })
+    return _http_session
+
+
+def get_config(ctx: click.Context) -> Config:
+    """Get the configuration for this CLI invocation, loading it only once."""
+    ctx.ensure_object(dict)
+    if "config" not in ctx.obj:
+        ctx.obj["config"] = load_config()
+    return ctx.obj["config"]
 
 
 @click.group()
 @click.version_option()
-def main():
+@click.pass_context
+def main(ctx: click.Context):
     """LIT Mux - Multi-AI multiplexer with REST API."""
-    pass
+    # Config is loaded lazily so that `init` runs before a default is created
+    ctx.ensure_object(dict)
 
 
 @main.command()
@@ -44,9 +79,10 @@ def init():
 @click.option("--host", default="127.0.0.1", help="Host to bind to")
 @click.option("--port", default=8000, help="Port to bind to")
 @click.option("--reload", is_flag=True, help="Enable auto-reload for development")
-def start(host: str, port: int, reload: bool):
+@click.pass_context
+def start(ctx: click.Context, host: str, port: int, reload: bool):
     """Start the lit-mux server."""
-    config = load_config()
+    config = get_config(ctx)
     
     # Override with CLI options
     host = host or config.server.host
@@ -59,20 +95,24 @@ def start(host: str, port: int, reload: bool):
         host=host,
         port=port,
         reload=reload,
-        log_level="info"
+        log_level="info",
+        loop=select_event_loop(),
+        http=select_http_protocol(),
+        interface="asgi3"
     )
 
 
 @main.command()
-def status():
+@click.pass_context
+def status(ctx: click.Context):
     """Check lit-mux server status."""
     import requests
     
-    config = load_config()
+    config = get_config(ctx)
     url = f"http://{config.server.host}:{config.server.port}/health"
     
     try:
-        response = requests.get(url, timeout=5)
+        response = get_http_session().get(url, timeout=5)
         if response.status_code == 200:
             click.echo("✅ lit-mux server is running")
             data = response.json()
@@ -90,18 +130,19 @@ def status():
 @click.argument("message")
 @click.option("--backend", help="Specific backend to use")
 @click.option("--session", help="Session ID to use")
-def send(message: str, backend: str, session: str):
+@click.option("--stream/--no-stream", default=True, help="Print the reply as it is generated")
+@click.pass_context
+def send(ctx: click.Context, message: str, backend: str, session: str, stream: bool):
     """Send a message directly via CLI."""
-    import requests
-    
-    config = load_config()
+    http = get_http_session()
+    config = get_config(ctx)
     base_url = f"http://{config.server.host}:{config.server.port}"
     
     try:
         # Create session if not provided
         if not session:
             backends = [backend] if backend else ["ollama"]  # Default backend
-            response = requests.post(f"{base_url}/sessions", json={
+            response = http.post(f"{base_url}/sessions", json={
                 "backends": backends,
                 "name": "CLI Session"
             })
@@ -113,7 +154,23 @@ def send(message: str, backend: str, session: str):
         if backend:
             payload["backend"] = backend
             
-        response = requests.post(f"{base_url}/sessions/{session}/message", json=payload)
+        if stream:
+            response = http.post(
+                f"{base_url}/sessions/{session}/message/stream", json=payload, stream=True
+            )
+            with response:
+                if response.status_code == 200:
+                    click.echo(f"\n{backend or 'assistant'}: ", nl=False)
+                    out = click.get_text_stream("stdout")
+                    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True):
+                        out.write(chunk)
+                        out.flush()
+                    click.echo()
+                else:
+                    click.echo(f"❌ Error: {response.json().get('detail', 'Unknown error')}")
+            return
+        
+        response = http.post(f"{base_url}/sessions/{session}/message", json=payload)
         
         if response.status_code == 200:
             data = response.json()
@@ -126,15 +183,14 @@ def send(message: str, backend: str, session: str):
 
 
 @main.command()
-def backends():
+@click.pass_context
+def backends(ctx: click.Context):
     """List available backends."""
-    import requests
-    
-    config = load_config()
+    config = get_config(ctx)
     url = f"http://{config.server.host}:{config.server.port}/backends"
     
     try:
-        response = requests.get(url)
+        response = get_http_session().get(url)
         if response.status_code == 200:
             backends = response.json()
             click.echo("Available backends:")
@@ -1,7 +1,7 @@
 """Core modules for lit-mux."""
 
 from .session import SessionManager, Session, Message
-from .router import MessageRouter, Backend
+from .router import MessageRouter, Backend, BackendResponse
 from .config import Config, load_config
 
 __all__ = [
@@ -10,6 +10,7 @@ __all__ = [
     "Message",
     "MessageRouter", 
     "Backend",
+    "BackendResponse",
     "Config",
     "load_config"
 ]
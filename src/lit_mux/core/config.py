@@ -4,10 +4,28 @@ Configuration management for lit-mux.
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import functools
+import re
+import sys
 import yaml
 import os
 
+# Prefer the libyaml-backed C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# Slotted dataclasses (no per-instance __dict__) where supported (3.10+)
+if sys.version_info >= (3, 10):
+    _dataclass = functools.partial(dataclass, slots=True)
+else:
+    _dataclass = dataclass
+
+# A whole config value of the form ${VAR}
+_ENV_VAR_RE = re.compile(r"\$\{([^}]*)\}")
+
 # Load .env file if it exists
 try:
     from dotenv import load_dotenv
@@ -17,7 +35,7 @@ except ImportError:
     pass
 
 
-@dataclass
+@_dataclass
 class ServerConfig:
     host: str = "127.0.0.1"
     port: int = 8000
@@ -25,7 +43,7 @@ class ServerConfig:
     api_key: Optional[str] = None
 
 
-@dataclass
+@_dataclass
 class MCPServerConfigData:
     name: str
     command: str
@@ -34,20 +52,22 @@ class MCPServerConfigData:
     timeout: int = 30
 
 
-@dataclass
+@_dataclass
 class MCPConfig:
     enabled: bool = False
     servers: List[MCPServerConfigData] = field(default_factory=list)
+    # Let POST /mcp/cycle start client-supplied commands (also needs server.api_key)
+    allow_runtime_servers: bool = False
 
 
-@dataclass
+@_dataclass
 class OllamaConfig:
     enabled: bool = False
     host: str = "http://localhost:11434"
     default_model: str = "llama3.1"
 
 
-@dataclass
+@_dataclass
 class ChatGPTConfig:
     enabled: bool = False
     api_key: Optional[str] = None
@@ -55,24 +75,33 @@ class ChatGPTConfig:
     base_url: str = "https://api.openai.com/v1"
 
 
-@dataclass
+@_dataclass
 class ClaudeDesktopConfig:
     enabled: bool = False
     automation: bool = True
 
 
-@dataclass
+@_dataclass
 class BackendsConfig:
     ollama: OllamaConfig = field(default_factory=OllamaConfig)
     chatgpt: ChatGPTConfig = field(default_factory=ChatGPTConfig)
     claude_desktop: ClaudeDesktopConfig = field(default_factory=ClaudeDesktopConfig)
 
 
-@dataclass
+@_dataclass
+class SessionsConfig:
+    # Least recently used sessions are evicted beyond max_sessions; None disables a bound
+    max_sessions: Optional[int] = 1000
+    max_messages: Optional[int] = 1000
+    ttl_seconds: Optional[float] = None
+
+
+@_dataclass
 class Config:
     server: ServerConfig = field(default_factory=ServerConfig)
     backends: BackendsConfig = field(default_factory=BackendsConfig)
     mcp: MCPConfig = field(default_factory=MCPConfig)
+    sessions: SessionsConfig = field(default_factory=SessionsConfig)
 
 
 def get_config_path() -> Path:
@@ -105,30 +134,58 @@ def create_default_config(config_file: Path) -> None:
                 "enabled": False,
                 "automation": True
             }
+        },
+        "sessions": {
+            "max_sessions": 1000,
+            "max_messages": 1000,
+            "ttl_seconds": None
         }
     }
     
     with open(config_file, 'w') as f:
-        yaml.dump(config_data, f, default_flow_style=False)
+        yaml.dump(config_data, f, Dumper=_YamlDumper, default_flow_style=False)
 
 
 def expand_env_vars(data: Any) -> Any:
-    """Recursively expand environment variables in configuration."""
-    if isinstance(data, dict):
-        return {k: expand_env_vars(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [expand_env_vars(item) for item in data]
-    elif isinstance(data, str) and data.startswith("${") and data.endswith("}"):
-        env_var = data[2:-1]
-        env_value = os.getenv(env_var)
-        # Return None for missing environment variables instead of the template string
-        return env_value if env_value is not None else None
-    else:
-        return data
+    """Expand ${VAR} environment variable references in configuration.
+    
+    Dicts and lists are walked with an explicit stack and updated in place.
+    Missing environment variables expand to None rather than the template
+    string.
+    """
+    if isinstance(data, str):
+        match = _ENV_VAR_RE.fullmatch(data)
+        return os.environ.get(match.group(1)) if match else data
+    
+    stack = [data]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            items = container.items()
+        elif isinstance(container, list):
+            items = enumerate(container)
+        else:
+            continue
+        
+        for key, value in items:
+            if isinstance(value, str):
+                match = _ENV_VAR_RE.fullmatch(value)
+                if match:
+                    container[key] = os.environ.get(match.group(1))
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    
+    return data
 
 
 def load_config() -> Config:
-    """Load configuration from file."""
+    """Load configuration from file.
+    
+    The parsed Config is cached until the file's modification time, the
+    MCP_SERVERS environment variable, or any environment variable the file
+    references as ${VAR} changes, so repeated calls only cost a stat() and a
+    few environment lookups. The returned object is shared; don't mutate it.
+    """
     config_file = get_config_path()
     
     if not config_file.exists():
@@ -136,8 +193,40 @@ def load_config() -> Config:
         config_file.parent.mkdir(parents=True, exist_ok=True)
         create_default_config(config_file)
     
+    mtime_ns = config_file.stat().st_mtime_ns
+    env_values = tuple(
+        (name, os.environ.get(name)) for name in _referenced_env_vars(config_file, mtime_ns)
+    )
+    
+    return _load_config_cached(
+        config_file,
+        mtime_ns,
+        os.getenv("MCP_SERVERS"),
+        env_values
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _referenced_env_vars(config_file: Path, mtime_ns: int) -> Tuple[str, ...]:
+    """Names of the ${VAR} references in the configuration file."""
     with open(config_file, 'r') as f:
-        data = yaml.safe_load(f)
+        return tuple(sorted(set(_ENV_VAR_RE.findall(f.read()))))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(
+    config_file: Path,
+    mtime_ns: int,
+    mcp_servers_env: Optional[str],
+    env_values: Tuple[Tuple[str, Optional[str]], ...]
+) -> Config:
+    """Parse the configuration file; cached by load_config().
+    
+    env_values holds the referenced environment variables' current values;
+    it is only part of the cache key, expand_env_vars reads them again.
+    """
+    with open(config_file, 'r') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
     
     # Expand environment variables
     data = expand_env_vars(data)
@@ -172,7 +261,6 @@ def load_config() -> Config:
         mcp_servers.append(server_config_data)
     
     # Then, load servers from MCP_SERVERS environment variable
-    mcp_servers_env = os.getenv("MCP_SERVERS")
     if mcp_servers_env:
         for server_config_str in mcp_servers_env.split(","):
             parts = server_config_str.strip().split("::")
@@ -195,11 +283,15 @@ def load_config() -> Config:
     
     mcp_config = MCPConfig(
         enabled=mcp_enabled,
-        servers=mcp_servers
+        servers=mcp_servers,
+        allow_runtime_servers=bool(mcp_data.get("allow_runtime_servers", False))
     )
     
+    sessions_config = SessionsConfig(**(data.get("sessions") or {}))
+    
     return Config(
         server=server_config,
         backends=backends_config,
-        mcp=mcp_config
+        mcp=mcp_config,
+        sessions=sessions_config
     )
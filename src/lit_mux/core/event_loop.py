@@ -0,0 +1,29 @@
+"""
+Event loop selection for lit-mux entry points.
+"""
+
+
+def select_event_loop() -> str:
+    """Pick the event loop implementation to hand to uvicorn.
+    
+    uvloop is used on Linux and macOS. It is not available on Windows,
+    where the stdlib asyncio loop is used.
+    """
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return "asyncio"
+    return "uvloop"
+
+
+def select_http_protocol() -> str:
+    """Pick the HTTP/1.1 parser to hand to uvicorn.
+    
+    httptools (the C llhttp parser) is preferred; h11 is the pure-Python
+    fallback when it is not installed.
+    """
+    try:
+        import httptools  # noqa: F401
+    except ImportError:
+        return "h11"
+    return "httptools"
@@ -4,12 +4,32 @@ Handles routing messages between clients and AI backends.
 """
 
 import asyncio
-from typing import Dict, List, Optional, Any, Callable
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, FrozenSet, List, Optional, Any, Callable, Tuple
 from abc import ABC, abstractmethod
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Python 3.12+ can start a task eagerly, running it synchronously up to its
+# first real suspension instead of waiting for the next loop iteration.
+_eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+
+
+def _create_task(coro) -> asyncio.Task:
+    """Create a task, eagerly started where the interpreter supports it."""
+    if _eager_task_factory is not None:
+        return _eager_task_factory(asyncio.get_running_loop(), coro)
+    return asyncio.create_task(coro)
+
+
+@dataclass(frozen=True)
+class BackendResponse:
+    """A backend's reply to a single message."""
+    __slots__ = ("content", "model")
+    content: str
+    model: Optional[str]
+
 
 class Backend(ABC):
     """Abstract base class for AI backends."""
@@ -20,10 +40,30 @@ class Backend(ABC):
         self.enabled = True
     
     @abstractmethod
-    async def send_message(self, content: str, context: List[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
-        """Send a message to the AI backend and return response with metadata."""
+    async def send_message(self, content: str, context: List[Dict[str, Any]] = None, **kwargs) -> Optional[BackendResponse]:
+        """Send a message to the AI backend and return response with metadata.
+        
+        Implementations return a BackendResponse, or None if the backend
+        failed to produce a response.
+        """
         pass
     
+    def resolve_model(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Model a message sent with these kwargs will use."""
+        return kwargs.get("model") or self.config.get("model") or getattr(self, "default_model", None)
+    
+    async def stream_message(self, content: str, context: List[Dict[str, Any]] = None, **kwargs) -> AsyncIterator[str]:
+        """Stream the response to a message as text chunks.
+        
+        Backends without native streaming yield the full response once.
+        Failures are raised rather than yielded as text.
+        """
+        response = await self.send_message(content, context, **kwargs)
+        if response is None:
+            raise RuntimeError(f"Backend {self.name} returned no response")
+        if response.content:
+            yield response.content
+    
     @abstractmethod
     async def health_check(self) -> bool:
         """Check if the backend is healthy and responsive."""
@@ -32,6 +72,14 @@ class Backend(ABC):
     async def configure(self, config: Dict[str, Any]) -> None:
         """Update backend configuration."""
         self.config.update(config)
+    
+    async def warmup(self) -> None:
+        """Open connections ahead of the first real request."""
+        pass
+    
+    async def aclose(self) -> None:
+        """Release resources held by the backend (connections, clients)."""
+        pass
 
 
 class MessageRouter:
@@ -39,12 +87,18 @@ class MessageRouter:
     
     def __init__(self):
         self._backends: Dict[str, Backend] = {}
+        # Read-only views rebuilt on registration, so iteration never walks
+        # the dict while register_backend might be resizing it
+        self._backends_snapshot: Tuple[Tuple[str, Backend], ...] = ()
+        self._backend_names: FrozenSet[str] = frozenset()
         self._middleware: List[Callable] = []
     
     def register_backend(self, backend: Backend) -> None:
         """Register an AI backend."""
         self._backends[backend.name] = backend
-        logger.info(f"Registered backend: {backend.name}")
+        self._backends_snapshot = tuple(self._backends.items())
+        self._backend_names = frozenset(self._backends)
+        logger.info("Registered backend: %s", backend.name)
     
     def get_backend(self, name: str) -> Optional[Backend]:
         """Get a backend by name."""
@@ -52,11 +106,15 @@ class MessageRouter:
     
     def list_backends(self) -> List[str]:
         """List all registered backend names."""
-        return list(self._backends.keys())
+        return [name for name, _ in self._backends_snapshot]
+    
+    def list_backends_set(self) -> FrozenSet[str]:
+        """Get registered backend names as a set, rebuilt only on registration."""
+        return self._backend_names
     
     def get_enabled_backends(self) -> List[str]:
         """Get list of enabled backend names."""
-        return [name for name, backend in self._backends.items() if backend.enabled]
+        return [name for name, backend in self._backends_snapshot if backend.enabled]
     
     async def send_message(
         self, 
@@ -64,30 +122,21 @@ class MessageRouter:
         content: str, 
         context: List[Dict[str, Any]] = None,
         **kwargs
-    ) -> Optional[Dict[str, Any]]:
+    ) -> Optional[BackendResponse]:
         """Send message to a specific backend."""
         backend = self.get_backend(backend_name)
         if not backend:
-            logger.error(f"Backend not found: {backend_name}")
+            logger.error("Backend not found: %s", backend_name)
             return None
         
         if not backend.enabled:
-            logger.warning(f"Backend disabled: {backend_name}")
+            logger.warning("Backend disabled: %s", backend_name)
             return None
         
         try:
-            response = await backend.send_message(content, context, **kwargs)
-            
-            # Handle both old string responses and new dict responses
-            if isinstance(response, dict):
-                return response
-            elif isinstance(response, str):
-                return {"content": response, "model": None}
-            else:
-                return None
-                
+            return await backend.send_message(content, context, **kwargs)
         except Exception as e:
-            logger.error(f"Error sending message to {backend_name}: {e}")
+            logger.error("Error sending message to %s: %s", backend_name, e)
             return None
     
     async def broadcast_message(
@@ -95,33 +144,54 @@ class MessageRouter:
         backend_names: List[str], 
         content: str, 
         context: List[Dict[str, Any]] = None
-    ) -> Dict[str, Optional[str]]:
+    ) -> Dict[str, Optional[BackendResponse]]:
         """Send message to multiple backends simultaneously."""
-        tasks = []
-        for backend_name in backend_names:
-            task = asyncio.create_task(
-                self.send_message(backend_name, content, context)
-            )
-            tasks.append((backend_name, task))
+        tasks = [
+            _create_task(self.send_message(backend_name, content, context))
+            for backend_name in backend_names
+        ]
+        responses = await asyncio.gather(*tasks, return_exceptions=True)
         
         results = {}
-        for backend_name, task in tasks:
-            try:
-                response = await task
-                results[backend_name] = response
-            except Exception as e:
-                logger.error(f"Broadcast error for {backend_name}: {e}")
-                results[backend_name] = None
+        for backend_name, response in zip(backend_names, responses):
+            if isinstance(response, Exception):
+                logger.error("Broadcast error for %s: %s", backend_name, response)
+                response = None
+            results[backend_name] = response
         
         return results
     
-    async def health_check_all(self) -> Dict[str, bool]:
-        """Check health of all backends."""
-        results = {}
-        for name, backend in self._backends.items():
+    async def warmup_all(self) -> None:
+        """Warm up all registered backends concurrently."""
+        backends = self._backends_snapshot
+        results = await asyncio.gather(
+            *(backend.warmup() for _, backend in backends),
+            return_exceptions=True
+        )
+        for (name, _), result in zip(backends, results):
+            if isinstance(result, Exception):
+                logger.warning("Warmup failed for %s: %s", name, result)
+    
+    async def close_all(self) -> None:
+        """Close all registered backends."""
+        for name, backend in self._backends_snapshot:
             try:
-                results[name] = await backend.health_check()
+                await backend.aclose()
             except Exception as e:
-                logger.error(f"Health check failed for {name}: {e}")
-                results[name] = False
+                logger.error("Error closing backend %s: %s", name, e)
+    
+    async def health_check_all(self) -> Dict[str, bool]:
+        """Check health of all backends concurrently."""
+        backends = self._backends_snapshot
+        checks = await asyncio.gather(
+            *(backend.health_check() for _, backend in backends),
+            return_exceptions=True
+        )
+        
+        results = {}
+        for (name, _), healthy in zip(backends, checks):
+            if isinstance(healthy, Exception):
+                logger.error("Health check failed for %s: %s", name, healthy)
+                healthy = False
+            results[name] = healthy is True
         return results
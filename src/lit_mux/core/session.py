@@ -3,57 +3,126 @@ Core session management for lit-mux.
 Handles creating, tracking, and managing AI conversation sessions.
 """
 
-import asyncio
+import time
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from typing import Deque, Dict, FrozenSet, List, Optional, Any, Union
+from dataclasses import field
 import json
 
+from .config import _dataclass
 
-@dataclass
+# Number of recent messages sent to backends as conversation context
+CONTEXT_WINDOW_SIZE = 10
+
+
+@_dataclass
 class Message:
     """A single message in a conversation."""
-    id: str
+    id: uuid.UUID
     content: str
     role: str  # 'user', 'assistant', 'system'
     backend: str
-    timestamp: datetime
+    timestamp: float  # epoch seconds from time.time()
     metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def timestamp_dt(self) -> datetime:
+        """The timestamp as a local datetime, built only when serializing."""
+        return datetime.fromtimestamp(self.timestamp)
 
 
-@dataclass 
+@_dataclass
 class Session:
     """An AI conversation session."""
-    id: str
+    id: uuid.UUID
     name: Optional[str]
     backends: List[str]
     messages: List[Message] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    # Epoch seconds; see created_at_dt/updated_at_dt for datetimes
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Messages ever added, including any trimmed beyond max_messages
+    message_count: int = 0
+    # Last CONTEXT_WINDOW_SIZE messages as ready-to-send {"role", "content"} dicts
+    context_window: Deque[Dict[str, str]] = field(
+        default_factory=lambda: deque(maxlen=CONTEXT_WINDOW_SIZE)
+    )
+    # Oldest messages are dropped beyond this many; None keeps them all
+    max_messages: Optional[int] = field(default=None, repr=False, compare=False)
+    # Set view of backends for O(1) membership checks
+    backend_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    # time.monotonic() of the last lookup, for SessionManager's idle TTL
+    last_access: float = field(default_factory=time.monotonic, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.backend_set = frozenset(self.backends)
+    
+    @property
+    def created_at_dt(self) -> datetime:
+        """Creation time as a local datetime."""
+        return datetime.fromtimestamp(self.created_at)
+    
+    @property
+    def updated_at_dt(self) -> datetime:
+        """Last update time as a local datetime."""
+        return datetime.fromtimestamp(self.updated_at)
     
     def add_message(self, content: str, role: str, backend: str, metadata: Dict[str, Any] = None) -> Message:
         """Add a message to the session."""
+        now = time.time()
         message = Message(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4(),
             content=content,
             role=role,
             backend=backend,
-            timestamp=datetime.now(),
+            timestamp=now,
             metadata=metadata or {}
         )
         self.messages.append(message)
-        self.updated_at = datetime.now()
+        if self.max_messages is not None and len(self.messages) > self.max_messages:
+            del self.messages[:-self.max_messages]
+        self.message_count += 1
+        self.context_window.append({"role": role, "content": content})
+        self.updated_at = now
         return message
 
 
 class SessionManager:
-    """Manages AI conversation sessions."""
+    """Manages AI conversation sessions.
     
-    def __init__(self):
-        self._sessions: Dict[str, Session] = {}
-        self._lock = asyncio.Lock()
+    Sessions are kept in least-recently-used order. Beyond max_sessions the
+    least recently used are evicted, and with ttl_seconds set, sessions idle
+    for longer than that expire. Each session keeps at most max_messages
+    messages. None disables any of these bounds.
+    """
+    
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        max_messages: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        if max_messages is not None and max_messages < 1:
+            raise ValueError(f"max_messages must be at least 1 or None, got {max_messages}")
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+        # Plain dict operations never await, so no lock is needed on the event loop
+        self._sessions: "OrderedDict[uuid.UUID, Session]" = OrderedDict()
+    
+    def _evict(self) -> None:
+        """Drop expired sessions, then least recently used ones over max_sessions."""
+        sessions = self._sessions
+        if self.ttl_seconds is not None:
+            cutoff = time.monotonic() - self.ttl_seconds
+            while sessions and next(iter(sessions.values())).last_access < cutoff:
+                sessions.popitem(last=False)
+        if self.max_sessions is not None:
+            while len(sessions) > self.max_sessions:
+                sessions.popitem(last=False)
     
     async def create_session(
         self, 
@@ -62,36 +131,45 @@ class SessionManager:
         metadata: Dict[str, Any] = None
     ) -> Session:
         """Create a new session."""
-        async with self._lock:
-            session_id = str(uuid.uuid4())
-            session = Session(
-                id=session_id,
-                name=name,
-                backends=backends,
-                metadata=metadata or {}
-            )
-            self._sessions[session_id] = session
-            return session
+        session_id = uuid.uuid4()
+        session = Session(
+            id=session_id,
+            name=name,
+            backends=backends,
+            metadata=metadata or {},
+            max_messages=self.max_messages
+        )
+        self._sessions[session_id] = session
+        self._evict()
+        return session
     
-    async def get_session(self, session_id: str) -> Optional[Session]:
+    async def get_session(self, session_id: Union[str, uuid.UUID]) -> Optional[Session]:
         """Get a session by ID."""
-        return self._sessions.get(session_id)
+        session_id = _parse_session_id(session_id)
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        
+        now = time.monotonic()
+        if self.ttl_seconds is not None and now - session.last_access > self.ttl_seconds:
+            del self._sessions[session_id]
+            return None
+        session.last_access = now
+        self._sessions.move_to_end(session_id)
+        return session
     
     async def list_sessions(self) -> List[Session]:
         """List all sessions."""
+        self._evict()
         return list(self._sessions.values())
     
-    async def delete_session(self, session_id: str) -> bool:
+    async def delete_session(self, session_id: Union[str, uuid.UUID]) -> bool:
         """Delete a session."""
-        async with self._lock:
-            if session_id in self._sessions:
-                del self._sessions[session_id]
-                return True
-            return False
+        return self._sessions.pop(_parse_session_id(session_id), None) is not None
     
     async def add_message_to_session(
         self, 
-        session_id: str, 
+        session_id: Union[str, uuid.UUID], 
         content: str, 
         role: str, 
         backend: str,
@@ -102,3 +180,13 @@ class SessionManager:
         if session:
             return session.add_message(content, role, backend, metadata)
         return None
+
+
+def _parse_session_id(session_id: Union[str, uuid.UUID]) -> Optional[uuid.UUID]:
+    """Normalize a session ID from the API into the UUID used as dict key."""
+    if isinstance(session_id, uuid.UUID):
+        return session_id
+    try:
+        return uuid.UUID(session_id)
+    except (ValueError, TypeError, AttributeError):
+        return None
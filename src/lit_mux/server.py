@@ -2,10 +2,13 @@
 Server entry point for lit-mux.
 """
 
+import asyncio
 import uvicorn
 import logging
+from typing import Optional
 from .api.server import LitMuxAPI
 from .core.config import load_config
+from .core.event_loop import select_event_loop, select_http_protocol
 from .backends.ollama import OllamaBackend
 
 logger = logging.getLogger(__name__)
@@ -36,30 +39,47 @@ def create_app():
 app_instance = create_app()
 app = app_instance.app
 
+# Background backend warmup started at startup; cancelled on shutdown if still running
+_warmup_task: Optional[asyncio.Task] = None
+
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize on startup."""
+    global _warmup_task
+    
+    # Open backend connections ahead of the first user request, in the
+    # background so an unreachable backend doesn't delay startup
+    _warmup_task = asyncio.create_task(app_instance.message_router.warmup_all())
+    
     # Load MCP servers from configuration
     config = load_config()
     if config.mcp.enabled and config.mcp.servers:
         from .services.mcp_client import MCPServerConfig
         
-        for server_config_data in config.mcp.servers:
-            server_config = MCPServerConfig(
+        server_configs = [
+            MCPServerConfig(
                 name=server_config_data.name,
                 command=server_config_data.command,
                 args=server_config_data.args,
                 env=server_config_data.env,
                 timeout=server_config_data.timeout
             )
-            await app_instance.mcp_client.add_server(server_config)
-            logger.info(f"Loaded MCP server from config: {server_config.name}")
+            for server_config_data in config.mcp.servers
+        ]
+        
+        # Start and handshake with all servers concurrently
+        results = await app_instance.mcp_client.add_servers(server_configs)
+        for server_config, loaded in zip(server_configs, results):
+            if loaded:
+                logger.info("Loaded MCP server from config: %s", server_config.name)
+            else:
+                logger.error("Failed to load MCP server from config: %s", server_config.name)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Cleanup MCP servers on shutdown."""
+    """Cleanup MCP servers and backend connections on shutdown."""
     logger.info("Application shutting down, cleaning up MCP servers")
     try:
         await app_instance.shutdown_mcp()
@@ -70,18 +90,55 @@ async def shutdown_event():
             await app_instance.mcp_client.force_shutdown()
         except Exception as force_e:
             logger.error(f"Error during force shutdown: {force_e}")
+    
+    # Stop a warmup still waiting on a backend before closing its client
+    if _warmup_task is not None and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+    
+    await app_instance.message_router.close_all()
+
+
+class LitMuxServer(uvicorn.Server):
+    """uvicorn server that starts MCP shutdown as soon as SIGINT/SIGTERM arrives.
+    
+    uvicorn runs the shutdown event only after open connections drain, so a
+    hung request would otherwise keep MCP children alive.
+    """
+    
+    _mcp_shutdown: Optional[asyncio.Task] = None
+    
+    def handle_exit(self, sig, frame) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None and self._mcp_shutdown is None:
+            loop.call_soon_threadsafe(self._start_mcp_shutdown, loop)
+        super().handle_exit(sig, frame)
+    
+    def _start_mcp_shutdown(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._mcp_shutdown is None:
+            self._mcp_shutdown = loop.create_task(app_instance.shutdown_mcp())
 
 
 def main():
     """Main entry point for lit-mux-server command."""
     config = load_config()
     
-    uvicorn.run(
-        "lit_mux.server:app",
+    server = LitMuxServer(uvicorn.Config(
+        app,
         host=config.server.host,
         port=config.server.port,
-        log_level=config.server.log_level
-    )
+        log_level=config.server.log_level,
+        loop=select_event_loop(),
+        http=select_http_protocol(),
+        interface="asgi3"
+    ))
+    server.run()
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ implementing direct MCP server connections and tool discovery.
 """
 
 import asyncio
-import json
+import itertools
 import logging
 import subprocess
 from pathlib import Path
@@ -14,8 +14,51 @@ from typing import Dict, List, Optional, Any, AsyncIterator
 import signal
 import os
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Below DEBUG: full JSON-RPC payloads, which can be hundreds of KB of tool schemas
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+# Longest JSON-RPC line (bytes) accepted from an MCP server; tool results
+# can carry whole files, so this is well above asyncio's 64 KiB default.
+STREAM_LIMIT = 16 * 1024 * 1024
+
+# Seconds force_shutdown waits to reap the processes it killed
+FORCE_SHUTDOWN_REAP_TIMEOUT = 1.0
+
+# Windows has no SIGKILL; os.kill() terminates the process for any signal there
+_SIGKILL = getattr(signal, "SIGKILL", signal.SIGTERM)
+
+# Handshake pieces shared by every server: initialize params (never mutated)
+# and the pre-encoded notifications/initialized line
+_INIT_PARAMS = {
+    "protocolVersion": "1.0.0",
+    "capabilities": {},
+    "clientInfo": {
+        "name": "lit-mux",
+        "version": "0.1.0"
+    }
+}
+_INITIALIZED_NOTIFICATION = orjson.dumps({
+    "jsonrpc": "2.0",
+    "method": "notifications/initialized"
+}) + b'\n'
+
+# Snapshot of os.environ shared by every spawned server; taken on first use
+# so that variables loaded from .env at config import are included
+_base_env: Optional[Dict[str, str]] = None
+
+
+def _get_base_env() -> Dict[str, str]:
+    """Get the environment MCP servers inherit, copying os.environ only once."""
+    global _base_env
+    if _base_env is None:
+        _base_env = dict(os.environ)
+    return _base_env
+
 
 class MCPServerConfig:
     """MCP server configuration."""
@@ -32,8 +75,14 @@ class MCPServerProcess:
     
     def __init__(self, config: MCPServerConfig):
         self.config = config
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.is_running = False
+        # Requests awaiting a response, keyed by JSON-RPC id; resolved by _reader_loop
+        self._pending: Dict[Any, asyncio.Future] = {}
+        # Queues receiving notifications/progress params, keyed by progress token
+        self._progress: Dict[Any, asyncio.Queue] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self._exit_task: Optional[asyncio.Task] = None
         
     async def start(self) -> bool:
         """Start the MCP server process."""
@@ -43,189 +92,296 @@ class MCPServerProcess:
                 await self.stop()
                 
             # Prepare environment
-            env = os.environ.copy()
-            env.update(self.config.env)
+            env = {**_get_base_env(), **self.config.env}
             
-            # Start the process with proper file descriptor management
-            self.process = subprocess.Popen(
-                [self.config.command] + self.config.args,
+            # Start the process with pipes served by the event loop
+            self.process = await asyncio.create_subprocess_exec(
+                self.config.command,
+                *self.config.args,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 env=env,
-                text=True,
+                limit=STREAM_LIMIT,
                 # Close file descriptors on exec to prevent leaks
                 close_fds=True,
                 # Set process group to allow clean termination
                 preexec_fn=os.setsid if hasattr(os, 'setsid') else None
             )
             
-            # Give it a moment to start
-            await asyncio.sleep(0.5)
-            
-            # Check if it's still running
-            if self.process.poll() is None:
+            # No startup wait: the initialize handshake that follows is the
+            # readiness check, and a child that dies fails it immediately
+            if self.process.returncode is None:
+                self._reader_task = asyncio.create_task(self._reader_loop())
+                self._exit_task = asyncio.create_task(self._watch_exit(self.process))
                 self.is_running = True
-                logger.info(f"Started MCP server: {self.config.name}")
+                logger.info("Started MCP server: %s", self.config.name)
                 return True
             else:
-                logger.error(f"MCP server {self.config.name} failed to start")
+                logger.error("MCP server %s failed to start", self.config.name)
                 await self._cleanup_process()
                 return False
                 
         except Exception as e:
-            logger.error(f"Failed to start MCP server {self.config.name}: {e}")
+            logger.error("Failed to start MCP server %s: %s", self.config.name, e)
             await self._cleanup_process()
             return False
     
     async def stop(self) -> None:
         """Stop the MCP server process."""
-        if self.process and self.is_running:
+        if not self.process:
+            return
+        if not self.is_running:
+            # Already exited or never finished starting; just release its pipes
+            await self._cleanup_process()
+            return
+        
+        # Cleared first so _watch_exit treats the exit as requested
+        self.is_running = False
+        try:
+            # Try graceful termination first
+            self.send_signal(signal.SIGTERM)
+            
+            # Wait for graceful shutdown
             try:
-                # Try graceful termination first
-                self.process.terminate()
-                
-                # Wait for graceful shutdown
-                try:
-                    await asyncio.wait_for(
-                        asyncio.create_task(self._wait_for_process()),
-                        timeout=2.0  # Reduced from 5.0 seconds
-                    )
-                except asyncio.TimeoutError:
-                    # Force kill if it doesn't shut down gracefully
-                    logger.warning(f"MCP server {self.config.name} didn't terminate gracefully, force killing")
-                    if hasattr(os, 'killpg') and self.process.pid:
-                        try:
-                            # Kill the entire process group
-                            os.killpg(os.getpgid(self.process.pid), signal.SIGKILL)
-                        except (OSError, ProcessLookupError):
-                            # Fallback to regular kill
-                            self.process.kill()
-                    else:
-                        self.process.kill()
-                
-                await self._cleanup_process()
-                logger.info(f"Stopped MCP server: {self.config.name}")
-                
-            except Exception as e:
-                logger.error(f"Error stopping MCP server {self.config.name}: {e}")
-                # Force cleanup even if there was an error
-                await self._cleanup_process()
+                await asyncio.wait_for(
+                    self.process.wait(),
+                    timeout=2.0  # Reduced from 5.0 seconds
+                )
+            except asyncio.TimeoutError:
+                # Force kill if it doesn't shut down gracefully
+                logger.warning("MCP server %s didn't terminate gracefully, force killing", self.config.name)
+                if hasattr(os, 'killpg') and self.process.pid:
+                    try:
+                        # Kill the entire process group
+                        os.killpg(os.getpgid(self.process.pid), signal.SIGKILL)
+                    except (OSError, ProcessLookupError):
+                        # Fallback to regular kill
+                        self.send_signal(_SIGKILL)
+                else:
+                    self.send_signal(_SIGKILL)
+            
+            await self._cleanup_process()
+            logger.info("Stopped MCP server: %s", self.config.name)
+            
+        except Exception as e:
+            logger.error("Error stopping MCP server %s: %s", self.config.name, e)
+            # Force cleanup even if there was an error
+            await self._cleanup_process()
+    
+    async def _watch_exit(self, process: asyncio.subprocess.Process) -> None:
+        """Mark the server stopped the moment its process exits.
+        
+        process.wait() completes from asyncio's child watcher, so there is no
+        per-request polling. An exit that stop() didn't ask for fails the
+        requests still waiting and releases the pipes.
+        """
+        returncode = await process.wait()
+        if self.process is not process or not self.is_running:
+            return
+        
+        logger.warning("MCP server %s exited with code %s", self.config.name, returncode)
+        self.is_running = False
+        self._fail_pending(ConnectionError(f"MCP server {self.config.name} exited"))
+        await self._cleanup_process()
+    
+    def send_signal(self, sig: int) -> None:
+        """Signal the server process without reaping it.
+        
+        Process.kill()/terminate() go through Popen.send_signal(), which polls
+        the child first; that can reap an exited child behind asyncio's child
+        watcher, which then loses its exit status.
+        """
+        if self.process is None or self.process.returncode is not None:
+            return
+        try:
+            os.kill(self.process.pid, sig)
+        except ProcessLookupError:
+            pass
+    
+    def is_alive(self) -> bool:
+        """Check whether the server process is still running."""
+        return self.process is not None and self.process.returncode is None
     
     async def _cleanup_process(self) -> None:
         """Clean up process and file descriptors."""
+        await self._stop_reader()
         if self.process:
             try:
-                # Close stdin/stdout/stderr to free file descriptors
+                # Close stdin; the transport closes stdout/stderr once the
+                # process has been reaped
                 if self.process.stdin:
                     self.process.stdin.close()
-                if self.process.stdout:
-                    self.process.stdout.close()
-                if self.process.stderr:
-                    self.process.stderr.close()
-                    
-                # Wait for process cleanup
-                if self.process.poll() is None:
-                    self.process.wait()
-                    
+                
+                # Never wait on a process that nothing has asked to exit
+                self.send_signal(_SIGKILL)
+                await self.process.wait()
+                
             except Exception as e:
-                logger.warning(f"Error during process cleanup for {self.config.name}: {e}")
+                logger.warning("Error during process cleanup for %s: %s", self.config.name, e)
             finally:
                 self.process = None
                 self.is_running = False
     
-    async def _wait_for_process(self) -> None:
-        """Wait for process to terminate."""
-        if self.process:
-            while self.process.poll() is None:
-                await asyncio.sleep(0.1)
-    
     async def send_request(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Send a JSON-RPC request to the MCP server."""
-        if not self.is_running or not self.process:
-            logger.warning(f"Cannot send request to {self.config.name}: server not running")
-            return None
+        """Send a JSON-RPC request to the MCP server.
         
-        # Check if process is still alive
-        if self.process.poll() is not None:
-            logger.warning(f"Process for {self.config.name} has died, marking as stopped")
-            self.is_running = False
-            await self._cleanup_process()
+        Requests are matched to responses by id, so several may be in flight
+        on one server at once.
+        """
+        if not self.is_running or not self.process:
+            logger.warning("Cannot send request to %s: server not running", self.config.name)
             return None
         
+        request_id = request.get("id")
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
         try:
             # Send request
-            request_json = json.dumps(request) + '\n'
-            logger.debug(f"📤 Sending to {self.config.name}: {request_json.strip()}")
+            request_json = orjson.dumps(request) + b'\n'
+            logger.debug("📤 Sending %s to %s", request.get("method"), self.config.name)
+            if logger.isEnabledFor(TRACE):
+                logger.log(TRACE, "📤 Full request to %s: %s", self.config.name, request)
             
             self.process.stdin.write(request_json)
-            self.process.stdin.flush()
+            # Wait for the pipe to drain so a slow reader throttles us
+            await self.process.stdin.drain()
             
-            # Read response, filtering notifications
-            response = await asyncio.wait_for(
-                self._read_response(request.get("id")),
-                timeout=self.config.timeout
-            )
+            # The reader task resolves the future when the matching id arrives
+            response = await asyncio.wait_for(future, timeout=self.config.timeout)
             
-            logger.debug(f"📥 Response from {self.config.name}: {response}")
+            logger.debug("📥 Response from %s for request %s", self.config.name, request_id)
+            if logger.isEnabledFor(TRACE):
+                logger.log(TRACE, "📥 Full response from %s: %s", self.config.name, response)
             return response
             
+        except asyncio.TimeoutError:
+            # Checked first: on Python 3.11+ TimeoutError is an OSError
+            logger.warning("MCP server %s request timeout after %ss", self.config.name, self.config.timeout)
+            return None
         except (BrokenPipeError, OSError) as e:
-            logger.warning(f"Broken pipe/connection to {self.config.name}: {e}")
+            logger.warning("Broken pipe/connection to %s: %s", self.config.name, e)
             self.is_running = False
             await self._cleanup_process()
             return None
-        except asyncio.TimeoutError:
-            logger.warning(f"MCP server {self.config.name} request timeout after {self.config.timeout}s")
-            return None
         except Exception as e:
-            logger.error(f"MCP request error for {self.config.name}: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("MCP request error for %s: %s", self.config.name, e)
             return None
+        finally:
+            if self._pending.get(request_id) is future:
+                del self._pending[request_id]
+            # The reader may have failed a future we never got to await
+            # (e.g. the write broke first); mark it handled
+            if not future.done():
+                future.cancel()
+            elif not future.cancelled():
+                future.exception()
     
-    async def _read_response(self, request_id: Optional[int]) -> Optional[Dict[str, Any]]:
-        """Read response from MCP server, filtering out notifications."""
-        if not self.process:
-            return None
+    async def send_notification(self, line: bytes) -> bool:
+        """Write a pre-encoded JSON-RPC notification line; no response is expected."""
+        if not self.is_running or not self.process:
+            logger.warning("Cannot send notification to %s: server not running", self.config.name)
+            return False
         
-        # Read multiple lines until we get the response or timeout
-        max_lines = 50  # Prevent infinite loop
-        for _ in range(max_lines):
-            try:
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, self.process.stdout.readline
-                )
-                
-                if not line:
+        try:
+            self.process.stdin.write(line)
+            # Wait for the pipe to drain so a slow reader throttles us
+            await self.process.stdin.drain()
+            return True
+        except (BrokenPipeError, ConnectionResetError) as e:
+            logger.warning("Broken pipe/connection to %s: %s", self.config.name, e)
+            self.is_running = False
+            return False
+    
+    async def _reader_loop(self) -> None:
+        """Read every line from the server and resolve the matching pending request."""
+        error: Exception = ConnectionError(f"MCP server {self.config.name} closed its output")
+        reader = self.process.stdout
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError:
                     break
-                    
-                line = line.strip()
-                if not line:
+                except asyncio.LimitOverrunError:
+                    # Drop the one oversized message instead of the whole connection
+                    logger.warning(
+                        "Discarding message over %d bytes from MCP server %s",
+                        STREAM_LIMIT, self.config.name
+                    )
+                    await self._discard_line(reader)
+                    continue
+                
+                # orjson accepts the surrounding whitespace, so skip blank
+                # lines without making a stripped copy of every line
+                if line.isspace():
                     continue
                 
                 try:
-                    data = json.loads(line)
-                    
-                    # Skip notifications
-                    if data.get("method") == "notifications/message":
-                        continue
-                    
-                    # Check if this is our response
-                    if request_id is not None and data.get("id") == request_id:
-                        return data
-                    elif request_id is None and "result" in data:
-                        return data
-                        
-                except json.JSONDecodeError:
+                    data = orjson.loads(line)
+                except orjson.JSONDecodeError:
                     # Skip invalid JSON lines
                     continue
-                    
-            except Exception as e:
-                logger.error(f"Error reading line from MCP server: {e}")
-                break
-        
-        return None
+                
+                if not isinstance(data, dict):
+                    continue
+                
+                if data.get("method") == "notifications/progress":
+                    params = data.get("params") or {}
+                    queue = self._progress.get(params.get("progressToken"))
+                    if queue is not None:
+                        queue.put_nowait(params)
+                    continue
+                
+                # Other notifications carry no id and have nobody waiting for them
+                future = self._pending.pop(data.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Error reading line from MCP server: %s", e)
+            error = ConnectionError(f"MCP server {self.config.name} output failed: {e}")
+        finally:
+            self._fail_pending(error)
+    
+    @staticmethod
+    async def _discard_line(reader: asyncio.StreamReader) -> None:
+        """Consume the rest of an over-limit line without buffering it."""
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return
+            except asyncio.LimitOverrunError as e:
+                await reader.readexactly(e.consumed)
+    
+    def watch_progress(self, token: Any) -> asyncio.Queue:
+        """Get a queue that receives progress notification params for a token."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._progress[token] = queue
+        return queue
+    
+    def unwatch_progress(self, token: Any) -> None:
+        """Stop delivering progress notifications for a token."""
+        self._progress.pop(token, None)
+    
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every request still waiting for a response."""
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+    
+    async def _stop_reader(self) -> None:
+        """Cancel the reader task and fail requests it will no longer answer."""
+        task, self._reader_task = self._reader_task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._fail_pending(ConnectionError(f"MCP server {self.config.name} stopped"))
 
 
 class MCPTool:
@@ -245,7 +401,12 @@ class MCPClient:
         """Initialize MCP client."""
         self.servers: Dict[str, MCPServerProcess] = {}
         self.tools: Dict[str, MCPTool] = {}
-        self.request_id = 0
+        # The same tools indexed as server name -> tool name -> tool
+        self._tools_by_server: Dict[str, Dict[str, MCPTool]] = {}
+        # Snapshot of self.tools values; reset whenever tools change
+        self._tools_snapshot: Optional[List[MCPTool]] = None
+        # JSON-RPC ids; next() on a C counter has no read-modify-write to interleave
+        self._request_ids = itertools.count(1)
         # Statistics for monitoring
         self.stats = {
             "servers_created": 0,
@@ -255,10 +416,17 @@ class MCPClient:
             "failed_requests": 0
         }
     
+    async def __aenter__(self) -> "MCPClient":
+        """Use the client as an async context manager."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Shut down all servers on exit."""
+        await self.shutdown()
+    
     def _get_next_request_id(self) -> int:
         """Get the next request ID."""
-        self.request_id += 1
-        return self.request_id
+        return next(self._request_ids)
         
     async def add_server(self, config: MCPServerConfig) -> bool:
         """Add and start an MCP server."""
@@ -266,7 +434,7 @@ class MCPClient:
         
         # Check if server already exists
         if config.name in self.servers:
-            logger.warning(f"MCP server {config.name} already exists, stopping existing one")
+            logger.warning("MCP server %s already exists, stopping existing one", config.name)
             await self.remove_server(config.name)
             
         server = MCPServerProcess(config)
@@ -276,80 +444,80 @@ class MCPClient:
             # Initialize the MCP server with proper handshake
             if await self._initialize_server(server):
                 await self._discover_tools(config.name)
-                logger.info(f"Successfully added MCP server {config.name}")
+                logger.info("Successfully added MCP server %s", config.name)
                 return True
             else:
                 # Clean up server if initialization failed
-                logger.error(f"Failed to initialize server {config.name}, cleaning up")
+                logger.error("Failed to initialize server %s, cleaning up", config.name)
                 self.stats["servers_failed"] += 1
                 await server.stop()
                 if config.name in self.servers:
                     del self.servers[config.name]
                 return False
         else:
-            logger.error(f"Failed to start server {config.name}")
+            logger.error("Failed to start server %s", config.name)
             self.stats["servers_failed"] += 1
             return False
         
+    async def add_servers(self, configs: List[MCPServerConfig]) -> List[bool]:
+        """Add and start several MCP servers concurrently.
+        
+        Returns one result per config, in order; a server that raised while
+        starting counts as False.
+        """
+        results = await asyncio.gather(
+            *(self.add_server(config) for config in configs),
+            return_exceptions=True
+        )
+        for config, result in zip(configs, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to add MCP server %s: %s", config.name, result)
+        return [result is True for result in results]
+    
     async def _initialize_server(self, server: MCPServerProcess) -> bool:
         """Initialize MCP server with proper handshake."""
         try:
-            logger.info(f"🔧 Initializing MCP server: {server.config.name}")
+            logger.info("🔧 Initializing MCP server: %s", server.config.name)
             
             # Step 1: Send initialize request
             init_request = {
                 "jsonrpc": "2.0",
                 "id": self._get_next_request_id(),
                 "method": "initialize",
-                "params": {
-                    "protocolVersion": "1.0.0",
-                    "capabilities": {},
-                    "clientInfo": {
-                        "name": "lit-mux",
-                        "version": "0.1.0"
-                    }
-                }
+                "params": _INIT_PARAMS
             }
             
-            logger.debug(f"📤 Sending initialize request to {server.config.name}")
+            logger.debug("📤 Sending initialize request to %s", server.config.name)
             init_response = await server.send_request(init_request)
             
             if not init_response or "error" in init_response:
-                logger.error(f"Failed to initialize {server.config.name}: {init_response}")
+                logger.error("Failed to initialize %s: %s", server.config.name, init_response)
                 return False
                 
-            logger.debug(f"✅ Initialize response from {server.config.name}: {init_response}")
+            logger.debug("✅ Initialize response from %s", server.config.name)
             
             # Step 2: Send initialized notification (no response expected)
-            init_notification = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized"
-            }
-            
-            logger.debug(f"📤 Sending initialized notification to {server.config.name}")
+            logger.debug("📤 Sending initialized notification to %s", server.config.name)
             
             # Send notification (no response expected)
-            request_json = json.dumps(init_notification) + '\n'
-            server.process.stdin.write(request_json)
-            server.process.stdin.flush()
+            if not await server.send_notification(_INITIALIZED_NOTIFICATION):
+                return False
             
-            logger.info(f"✅ Successfully initialized MCP server: {server.config.name}")
+            logger.info("✅ Successfully initialized MCP server: %s", server.config.name)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to initialize MCP server {server.config.name}: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Failed to initialize MCP server %s: %s", server.config.name, e)
             return False
     
     async def _discover_tools(self, server_name: str) -> None:
         """Discover available tools from an MCP server."""
         server = self.servers.get(server_name)
         if not server:
-            logger.warning(f"Cannot discover tools: server {server_name} not found")
+            logger.warning("Cannot discover tools: server %s not found", server_name)
             return
         
-        logger.info(f"🔍 Starting tool discovery for server: {server_name}")
+        logger.info("🔍 Starting tool discovery for server: %s", server_name)
         
         try:
             # Send tools/list request
@@ -360,39 +528,47 @@ class MCPClient:
                 "params": {}
             }
             
-            logger.debug(f"📤 Sending tools/list request: {request}")
+            logger.debug("📤 Sending tools/list request to %s", server_name)
             response = await server.send_request(request)
-            logger.debug(f"📥 Received response: {response}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "📥 Received response with %d tools",
+                    len(response.get("result", {}).get("tools", [])) if response else 0
+                )
             
             if response and "result" in response:
                 tools_data = response["result"].get("tools", [])
-                logger.info(f"🔧 Found {len(tools_data)} tools from {server_name}")
                 
+                server_tools: Dict[str, MCPTool] = {}
                 for tool_data in tools_data:
-                    try:
-                        tool = MCPTool(
-                            name=tool_data.get("name", ""),
-                            description=tool_data.get("description", ""),
-                            parameters=tool_data.get("inputSchema", {})
-                        )
-                        tool.server_name = server_name
-                        
-                        # Store with server prefix to avoid conflicts
-                        tool_key = f"{server_name}.{tool.name}"
-                        self.tools[tool_key] = tool
-                        logger.info(f"✅ Registered tool: {tool_key} - {tool.description}")
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to process tool {tool_data.get('name', 'unknown')}: {e}")
+                    if not isinstance(tool_data, dict):
+                        logger.error("Skipping malformed tool from %s: %r", server_name, tool_data)
+                        continue
+                    tool = MCPTool(
+                        name=tool_data.get("name", ""),
+                        description=tool_data.get("description", ""),
+                        parameters=tool_data.get("inputSchema", {})
+                    )
+                    tool.server_name = server_name
+                    server_tools[tool.name] = tool
                 
-                logger.info(f"Discovered {len(tools_data)} tools from {server_name}")
+                # Register the whole batch at once; tools are stored with a
+                # server prefix to avoid conflicts
+                self._tools_by_server.setdefault(server_name, {}).update(server_tools)
+                self.tools.update(
+                    (f"{server_name}.{name}", tool) for name, tool in server_tools.items()
+                )
+                self._tools_snapshot = None
+                
+                logger.info("🔧 Registered %d tools from %s", len(server_tools), server_name)
+                if logger.isEnabledFor(logging.DEBUG):
+                    for name, tool in server_tools.items():
+                        logger.debug("Tool %s.%s description: %s", server_name, name, tool.description)
             else:
-                logger.warning(f"No result in response from {server_name}: {response}")
+                logger.warning("No result in response from %s: %s", server_name, response)
         
         except Exception as e:
-            logger.error(f"Failed to discover tools from {server_name}: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Failed to discover tools from %s: %s", server_name, e)
     
     async def shutdown(self) -> None:
         """Shutdown all MCP servers."""
@@ -401,20 +577,29 @@ class MCPClient:
         # Create a list of servers to shutdown to avoid modifying dict during iteration
         servers_to_shutdown = list(self.servers.items())
         
-        for server_name, server in servers_to_shutdown:
-            try:
-                await server.stop()
-            except Exception as e:
-                logger.error(f"Error shutting down server {server_name}: {e}")
+        # Servers stop independently, so wait on all of them at once
+        await asyncio.gather(*(
+            self._safe_stop(server_name, server)
+            for server_name, server in servers_to_shutdown
+        ))
         
         self.servers.clear()
         self.tools.clear()
+        self._tools_by_server.clear()
+        self._tools_snapshot = None
         logger.info("Shut down all MCP servers")
     
+    async def _safe_stop(self, server_name: str, server: MCPServerProcess) -> None:
+        """Stop a server, logging rather than raising any error."""
+        try:
+            await server.stop()
+        except Exception as e:
+            logger.error("Error shutting down server %s: %s", server_name, e)
+    
     async def remove_server(self, server_name: str) -> bool:
         """Remove a specific MCP server."""
         if server_name not in self.servers:
-            logger.warning(f"Server {server_name} not found")
+            logger.warning("Server %s not found", server_name)
             return False
         
         server = self.servers[server_name]
@@ -424,40 +609,93 @@ class MCPClient:
             del self.servers[server_name]
             
             # Remove tools from this server
-            tools_to_remove = [tool_key for tool_key, tool in self.tools.items() 
-                             if tool.server_name == server_name]
-            for tool_key in tools_to_remove:
-                del self.tools[tool_key]
+            tools_to_remove = self._tools_by_server.pop(server_name, {})
+            for tool_name in tools_to_remove:
+                self.tools.pop(f"{server_name}.{tool_name}", None)
+            self._tools_snapshot = None
             
             self.stats["servers_removed"] += 1
-            logger.info(f"Removed MCP server {server_name} and {len(tools_to_remove)} tools")
+            logger.info("Removed MCP server %s and %d tools", server_name, len(tools_to_remove))
             return True
             
         except Exception as e:
-            logger.error(f"Error removing server {server_name}: {e}")
+            logger.error("Error removing server %s: %s", server_name, e)
             return False
         
     async def force_shutdown(self) -> None:
-        """Force immediate shutdown of all MCP servers without waiting."""
+        """Force immediate shutdown of all MCP servers without graceful termination."""
+        killed = []
         for server in self.servers.values():
             if server.process and server.is_running:
                 try:
-                    server.process.kill()  # Immediate kill, no graceful termination
-                    server.is_running = False
+                    if server.process.returncode is None:
+                        server.send_signal(_SIGKILL)  # Immediate kill, no graceful termination
+                        killed.append(server.process)
                 except Exception as e:
-                    logger.warning(f"Error force-killing MCP server {server.config.name}: {e}")
-                    server.is_running = False
+                    logger.warning("Error force-killing MCP server %s: %s", server.config.name, e)
+                server.is_running = False
+                if server._reader_task:
+                    server._reader_task.cancel()
+        
+        # Reap all killed children at once; SIGKILL makes this near-instant
+        if killed:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(process.wait() for process in killed), return_exceptions=True),
+                    timeout=FORCE_SHUTDOWN_REAP_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Some killed MCP server processes have not exited yet")
         
         self.servers.clear()
         self.tools.clear()
+        self._tools_by_server.clear()
+        self._tools_snapshot = None
         logger.info("Force shut down all MCP servers")
     
     def get_available_tools(self) -> List[MCPTool]:
-        """Get list of all available tools."""
-        return list(self.tools.values())
+        """Get list of all available tools.
+
+        The returned list is shared between callers until the tool set
+        changes, so treat it as read-only.
+        """
+        if self._tools_snapshot is None:
+            self._tools_snapshot = list(self.tools.values())
+        return self._tools_snapshot
     
     async def execute_tool(self, server_name: str, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """Execute a tool on the specified MCP server."""
+        """Execute a tool on the specified MCP server.
+        
+        Collects execute_tool_stream(): returns the result's content list, or
+        the whole result when it has no content list.
+        """
+        content = []
+        try:
+            async for item in self.execute_tool_stream(server_name, tool_name, arguments):
+                kind = item.get("type")
+                if kind == "progress":
+                    continue
+                if kind == "result":
+                    return item["result"]
+                content.append(item)
+        except Exception as e:
+            logger.error("Error executing tool %s on server %s: %s", tool_name, server_name, e)
+            raise
+        return content
+    
+    async def execute_tool_stream(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a tool, yielding items as they become available.
+        
+        Progress notifications the server sends while the call runs are
+        yielded as {"type": "progress", ...}. Once the call completes, each
+        entry of the result's content list is yielded in turn; a result with
+        no content list is yielded once as {"type": "result", "result": ...}.
+        """
         server = self.servers.get(server_name)
         if not server:
             raise ValueError(f"MCP server {server_name} not found")
@@ -465,39 +703,55 @@ class MCPClient:
         if not server.is_running:
             raise ValueError(f"MCP server {server_name} is not running")
         
-        try:
-            # Create tool call request
-            request = {
-                "jsonrpc": "2.0",
-                "id": self._get_next_request_id(),
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                }
+        request_id = self._get_next_request_id()
+        request = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": arguments,
+                "_meta": {"progressToken": request_id}
             }
+        }
+        
+        progress = server.watch_progress(request_id)
+        call = asyncio.ensure_future(server.send_request(request))
+        try:
+            while True:
+                update = asyncio.ensure_future(progress.get())
+                done, _ = await asyncio.wait({call, update}, return_when=asyncio.FIRST_COMPLETED)
+                if update in done:
+                    yield {"type": "progress", **update.result()}
+                else:
+                    update.cancel()
+                if call in done:
+                    break
             
-            # Send request to server
-            response = await server.send_request(request)
-            
-            if "error" in response:
-                error = response["error"]
-                raise Exception(f"Tool execution error: {error.get('message', 'Unknown error')}")
-            
-            # Return the result
-            result = response.get("result", {})
-            if "content" in result:
-                return result["content"]
-            else:
-                return result
-                
-        except Exception as e:
-            logger.error(f"Error executing tool {tool_name} on server {server_name}: {e}")
-            raise
+            while not progress.empty():
+                yield {"type": "progress", **progress.get_nowait()}
+            response = call.result()
+        finally:
+            server.unwatch_progress(request_id)
+            if not call.done():
+                call.cancel()
+        
+        if response is None:
+            raise Exception(f"Tool execution error: no response from {server_name}")
+        if "error" in response:
+            error = response["error"]
+            raise Exception(f"Tool execution error: {error.get('message', 'Unknown error')}")
+        
+        result = response.get("result", {})
+        if "content" not in result:
+            yield {"type": "result", "result": result}
+            return
+        for item in result["content"]:
+            yield item
     
     def get_tools_by_server(self, server_name: str) -> List[MCPTool]:
         """Get tools from a specific server."""
-        return [tool for tool in self.tools.values() if tool.server_name == server_name]
+        return list(self._tools_by_server.get(server_name, {}).values())
     
     async def health_check(self) -> Dict[str, Any]:
         """Get health status of all MCP servers."""
@@ -509,18 +763,18 @@ class MCPClient:
         
         for server_name, server in self.servers.items():
             # Check if process is actually running
-            process_alive = server.process and server.process.poll() is None
+            process_alive = server.is_alive()
             
             health_info["servers"][server_name] = {
                 "running": server.is_running and process_alive,
                 "process_alive": process_alive,
-                "tools": len(self.get_tools_by_server(server_name)),
+                "tools": len(self._tools_by_server.get(server_name, ())),
                 "pid": server.process.pid if server.process else None
             }
             
             # Update server status if process died
             if server.is_running and not process_alive:
-                logger.warning(f"Detected dead process for server {server_name}")
+                logger.warning("Detected dead process for server %s", server_name)
                 server.is_running = False
         
         return health_info
@@ -32,6 +32,10 @@ class PromptComposer:
     def __init__(self, config=None):
         """Initialize the prompt composer."""
         self.config = config
+        # Last rendered tool catalog and the tool list it was built from; the
+        # reference also keeps that list's id from being reused
+        self._tools_source: Optional[List[Any]] = None
+        self._tools_json: str = ""
         
     def compose_system_prompt(
         self,
@@ -176,7 +180,7 @@ class PromptComposer:
         
         if mcp_tools:
             # Use exact format from working lit-lib implementation
-            tools_json = self._format_tools_for_prompt_detailed(mcp_tools)
+            tools_json = self._get_tools_json(mcp_tools)
             
             system_prompt = f"""{base_prompt}
 
@@ -205,6 +209,17 @@ When a user asks you to read or write files or access system resources, you shou
             "version": "1.0.0-fallback"
         }
     
+    def _get_tools_json(self, mcp_tools: List[Any]) -> str:
+        """Get the tool catalog JSON, re-rendering only when the tool list changes.
+        
+        MCPClient.get_available_tools() returns a new list whenever any tool
+        (including its parameters) changes, so the list's identity is the key.
+        """
+        if mcp_tools is not self._tools_source:
+            self._tools_json = self._format_tools_for_prompt_detailed(mcp_tools)
+            self._tools_source = mcp_tools
+        return self._tools_json
+    
     def _format_tools_for_prompt_detailed(self, mcp_tools: List[Any]) -> str:
         """Format tools for inclusion in the system prompt using lit-lib approach."""
         tool_list = []
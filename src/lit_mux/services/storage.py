@@ -3,19 +3,49 @@ Storage service copied from lit-tui.
 Handles persistent storage of chat sessions and messages.
 """
 
-import json
+import asyncio
 import logging
+import os
 import shutil
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Union
 from uuid import uuid4
 
 import aiofiles
+import orjson
 
 
 logger = logging.getLogger(__name__)
 
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    title TEXT,
+    created TEXT,
+    updated TEXT,
+    model TEXT,
+    message_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated DESC);
+"""
+
+INDEX_COLUMNS = ("session_id", "title", "created", "updated", "model", "message_count")
+
+
+def _session_summary(session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the list_sessions summary for serialized session data."""
+    return {
+        "session_id": session_data["session_id"],
+        "title": session_data["title"],
+        "created": session_data["created"],
+        "updated": session_data["updated"],
+        "model": session_data.get("model"),
+        "message_count": session_data.get("message_count", len(session_data.get("messages", [])))
+    }
+
 
 class ChatMessage:
     """Represents a chat message."""
@@ -24,22 +54,30 @@ class ChatMessage:
         self,
         role: str,
         content: str,
-        timestamp: Optional[datetime] = None,
+        timestamp: Union[datetime, str, None] = None,
         model: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
     ):
         self.role = role
         self.content = content
-        self.timestamp = timestamp or datetime.now(timezone.utc)
+        # ISO 8601 string; see timestamp_dt for a datetime
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+        self.timestamp = timestamp if isinstance(timestamp, str) else timestamp.isoformat()
         self.model = model
         self.metadata = metadata or {}
     
+    @property
+    def timestamp_dt(self) -> datetime:
+        """The timestamp as a datetime, parsed only when needed."""
+        return datetime.fromisoformat(self.timestamp)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
         return {
             "role": self.role,
             "content": self.content,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.timestamp,
             "model": self.model,
             "metadata": self.metadata
         }
@@ -47,11 +85,10 @@ class ChatMessage:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ChatMessage":
         """Create from dictionary."""
-        timestamp = datetime.fromisoformat(data["timestamp"])
         return cls(
             role=data["role"],
             content=data["content"],
-            timestamp=timestamp,
+            timestamp=data["timestamp"],
             model=data.get("model"),
             metadata=data.get("metadata", {})
         )
@@ -79,17 +116,23 @@ class ChatSession:
         self.messages = messages or []
         self.metadata = metadata or {}
         self.is_saved = is_saved
+        # Set by StorageService when the on-disk message log matches this
+        # session and ends on a complete line, so new messages can be appended
+        self.log_appendable = False
+        # Kept up to date by add_message so titling doesn't rescan history
+        self._user_msg_count = sum(1 for m in self.messages if m.role == "user")
     
     def add_message(self, message: ChatMessage) -> None:
         """Add a message to the session."""
         self.messages.append(message)
         self.updated = datetime.now(timezone.utc)
         
-        # Auto-generate title from first user message if not set
-        if (self.title.startswith("Chat ") and 
-            message.role == "user" and 
-            len([m for m in self.messages if m.role == "user"]) == 1):
-            self.title = self._generate_title(message.content)
+        if message.role == "user":
+            self._user_msg_count += 1
+            
+            # Auto-generate title from first user message if not set
+            if self._user_msg_count == 1 and self.title.startswith("Chat "):
+                self.title = self._generate_title(message.content)
     
     def _generate_title(self, content: str) -> str:
         """Generate a title from message content."""
@@ -111,6 +154,18 @@ class ChatSession:
             "metadata": self.metadata
         }
     
+    def to_meta_dict(self) -> Dict[str, Any]:
+        """Convert session metadata, without messages, for the meta file."""
+        return {
+            "session_id": self.session_id,
+            "title": self.title,
+            "created": self.created.isoformat(),
+            "updated": self.updated.isoformat(),
+            "model": self.model,
+            "message_count": len(self.messages),
+            "metadata": self.metadata
+        }
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ChatSession":
         """Create from dictionary."""
@@ -138,65 +193,138 @@ class StorageService:
         self.storage_dir = storage_dir or Path.home() / ".lit-mux"
         self.sessions_dir = self.storage_dir / "sessions"
         
-        # Ensure directories exist
-        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        # Ensure directories exist (creates storage_dir too)
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Session file paths, formatted with a session id
+        sessions_prefix = str(self.sessions_dir) + os.sep
+        self._meta_path_fmt = sessions_prefix + "%s.meta.json"
+        self._messages_path_fmt = sessions_prefix + "%s.jsonl"
+        self._legacy_path_fmt = sessions_prefix + "%s.json"
+        
+        # Session metadata index; the session files remain the source of truth.
+        # All sqlite access happens on one worker thread, which owns the connection.
+        self.index_path = self.storage_dir / "index.db"
+        self._index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lit-mux-index")
+        self._index_conn: Optional[sqlite3.Connection] = None
+        self._index_ready: Optional[asyncio.Future] = None
+        # Sessions directory mtime the index was last reconciled against, and
+        # whether an index write failed so the rows can no longer be trusted
+        self._index_dir_mtime: Optional[int] = None
+        self._index_dirty = False
     
     async def save_session(self, session: ChatSession) -> None:
-        """Save a session to disk."""
+        """Save a session to disk, rewriting its full message log."""
         try:
-            session_file = self.sessions_dir / f"{session.session_id}.json"
-            session_data = session.to_dict()
+            session_id = session.session_id
+            
+            async with aiofiles.open(self._messages_path_fmt % session_id, 'wb') as f:
+                await f.write(b"".join(orjson.dumps(msg.to_dict()) + b"\n" for msg in session.messages))
+            
+            await self._write_meta(session)
             
-            async with aiofiles.open(session_file, 'w') as f:
-                await f.write(json.dumps(session_data, indent=2))
+            # Sessions from before the split layout are migrated on save
+            try:
+                os.unlink(self._legacy_path_fmt % session_id)
+            except FileNotFoundError:
+                pass
             
             session.is_saved = True
-            logger.debug(f"Saved session {session.session_id}")
+            session.log_appendable = True
+            logger.debug(f"Saved session {session_id}")
             
         except Exception as e:
             logger.error(f"Failed to save session {session.session_id}: {e}")
             raise
     
+    async def append_message(self, session: ChatSession, message: ChatMessage) -> None:
+        """Add a message to a session and append it to the session's log."""
+        session.add_message(message)
+        
+        # New, not-yet-migrated and torn-log sessions need a full write first
+        if not session.log_appendable:
+            await self.save_session(session)
+            return
+        
+        try:
+            async with aiofiles.open(self._messages_path_fmt % session.session_id, 'ab') as f:
+                await f.write(orjson.dumps(message.to_dict()) + b"\n")
+            
+            await self._write_meta(session)
+            logger.debug(f"Appended message to session {session.session_id}")
+            
+        except Exception as e:
+            logger.error(f"Failed to append message to session {session.session_id}: {e}")
+            raise
+    
+    async def _write_meta(self, session: ChatSession) -> None:
+        """Write a session's metadata file and update the index."""
+        meta = session.to_meta_dict()
+        
+        async with aiofiles.open(self._meta_path_fmt % session.session_id, 'wb') as f:
+            await f.write(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+        
+        await self._update_index(_session_summary(meta))
+    
     async def load_session(self, session_id: str) -> Optional[ChatSession]:
         """Load a session from disk."""
         try:
-            session_file = self.sessions_dir / f"{session_id}.json"
+            try:
+                async with aiofiles.open(self._meta_path_fmt % session_id, 'rb') as f:
+                    session_data = orjson.loads(await f.read())
+            except FileNotFoundError:
+                return await self._load_legacy_session(session_id)
             
-            if not session_file.exists():
-                return None
+            # One read for the whole log; iterating it line by line would
+            # cost a worker-thread round trip per message
+            try:
+                async with aiofiles.open(self._messages_path_fmt % session_id, 'rb') as f:
+                    log_data = await f.read()
+            except FileNotFoundError:
+                log_data = b""
             
-            async with aiofiles.open(session_file, 'r') as f:
-                session_data = json.loads(await f.read())
+            messages = []
+            for line in log_data.splitlines():
+                if not line or line.isspace():
+                    continue
+                try:
+                    messages.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    # A torn final line from an interrupted append
+                    logger.warning(f"Skipping unreadable message line in session {session_id}")
             
-            return ChatSession.from_dict(session_data)
+            session_data["messages"] = messages
+            session = ChatSession.from_dict(session_data)
+            # A log not ending in a newline has a torn final append; the next
+            # append rewrites the log rather than extending the fragment
+            session.log_appendable = not log_data or log_data.endswith(b"\n")
+            return session
             
         except Exception as e:
             logger.error(f"Failed to load session {session_id}: {e}")
             return None
     
+    async def _load_legacy_session(self, session_id: str) -> Optional[ChatSession]:
+        """Load a session stored as a single JSON document."""
+        try:
+            async with aiofiles.open(self._legacy_path_fmt % session_id, 'rb') as f:
+                session_data = orjson.loads(await f.read())
+        except FileNotFoundError:
+            return None
+        
+        return ChatSession.from_dict(session_data)
+    
     async def list_sessions(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """List available sessions with metadata."""
         try:
-            sessions = []
-            
-            for session_file in self.sessions_dir.glob("*.json"):
-                try:
-                    async with aiofiles.open(session_file, 'r') as f:
-                        session_data = json.loads(await f.read())
-                    
-                    sessions.append({
-                        "session_id": session_data["session_id"],
-                        "title": session_data["title"],
-                        "created": session_data["created"],
-                        "updated": session_data["updated"],
-                        "model": session_data.get("model"),
-                        "message_count": len(session_data.get("messages", []))
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to read session file {session_file}: {e}")
-                    continue
+            await self._ensure_index()
+            await self._sync_index()
+            return await self._run_index(self._index_select, limit)
+        except Exception as e:
+            logger.warning(f"Session index unavailable, scanning session files: {e}")
+        
+        try:
+            sessions = await self._scan_sessions()
             
             # Sort by updated time (most recent first)
             sessions.sort(key=lambda x: x["updated"], reverse=True)
@@ -210,14 +338,188 @@ class StorageService:
             logger.error(f"Failed to list sessions: {e}")
             return []
     
+    def _session_files(self) -> Dict[str, str]:
+        """Map each session id on disk to the file holding its metadata."""
+        with os.scandir(self.sessions_dir) as entries:
+            names = {entry.name for entry in entries if entry.is_file()}
+        
+        # Metadata files, plus legacy single-file sessions not yet migrated
+        session_files = {}
+        for name in names:
+            if name.endswith(".meta.json"):
+                session_files[name[:-10]] = os.path.join(self.sessions_dir, name)
+            elif name.endswith(".json") and name[:-5] + ".meta.json" not in names:
+                session_files[name[:-5]] = os.path.join(self.sessions_dir, name)
+        return session_files
+    
+    async def _scan_sessions(self, session_files: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Summarize the given session files, or every session file on disk."""
+        if session_files is None:
+            session_files = list(self._session_files().values())
+        
+        # Read all session files concurrently
+        results = await asyncio.gather(
+            *(self._read_session_summary(path) for path in session_files),
+            return_exceptions=True
+        )
+        
+        sessions = []
+        for session_file, result in zip(session_files, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to read session file {session_file}: {result}")
+                continue
+            sessions.append(result)
+        
+        return sessions
+    
+    async def _read_session_summary(self, path: str) -> Dict[str, Any]:
+        """Read one session file and summarize it for list_sessions."""
+        async with aiofiles.open(path, 'rb') as f:
+            session_data = orjson.loads(await f.read())
+        
+        return _session_summary(session_data)
+    
+    async def _run_index(self, func, *args):
+        """Run a blocking index operation on the index thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._index_executor, func, *args)
+    
+    async def _ensure_index(self) -> None:
+        """Open the index, backfilling it from session files on first creation."""
+        if self._index_ready is None:
+            self._index_ready = asyncio.ensure_future(self._open_index())
+        try:
+            await asyncio.shield(self._index_ready)
+        except Exception:
+            # Allow a later call to retry
+            self._index_ready = None
+            raise
+    
+    async def _open_index(self) -> None:
+        """Connect to the index and populate it if it was just created."""
+        created = await self._run_index(self._index_connect)
+        if created:
+            sessions = await self._scan_sessions()
+            await self._run_index(self._index_upsert, sessions)
+            logger.info(f"Built session index with {len(sessions)} sessions")
+    
+    async def _sync_index(self) -> None:
+        """Reconcile the index with the session files before it is read.
+        
+        After a failed index write every row is rebuilt from the files. When
+        the sessions directory has changed since the last check, rows are
+        added for session files the index lacks and dropped for sessions
+        whose files are gone.
+        """
+        # Stat before scanning, so a change during the scan is seen next time
+        dir_mtime = os.stat(self.sessions_dir).st_mtime_ns
+        if self._index_dirty:
+            self._index_dirty = False
+            try:
+                sessions = await self._scan_sessions()
+                await self._run_index(self._index_replace_all, sessions)
+            except Exception:
+                self._index_dirty = True
+                raise
+            logger.info(f"Rebuilt session index with {len(sessions)} sessions")
+        elif dir_mtime != self._index_dir_mtime:
+            session_files = self._session_files()
+            indexed = await self._run_index(self._index_ids)
+            missing = [path for session_id, path in session_files.items() if session_id not in indexed]
+            stale = [session_id for session_id in indexed if session_id not in session_files]
+            if missing:
+                await self._run_index(self._index_upsert, await self._scan_sessions(missing))
+            for session_id in stale:
+                await self._run_index(self._index_delete, session_id)
+            if missing or stale:
+                logger.info(f"Session index reconciled: {len(missing)} added, {len(stale)} removed")
+        self._index_dir_mtime = dir_mtime
+    
+    async def _update_index(self, summary: Dict[str, Any]) -> None:
+        """Record a saved session in the index."""
+        try:
+            await self._ensure_index()
+            await self._run_index(self._index_upsert, [summary])
+        except Exception as e:
+            # The next list_sessions rebuilds the index from the files
+            self._index_dirty = True
+            logger.warning(f"Failed to index session {summary['session_id']}: {e}")
+    
+    def _index_connect(self) -> bool:
+        """Open the sqlite index; returns True if the schema had to be created."""
+        conn = sqlite3.connect(str(self.index_path))
+        try:
+            existing = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sessions'"
+            ).fetchone()
+            conn.executescript(INDEX_SCHEMA)
+        except Exception:
+            conn.close()
+            raise
+        self._index_conn = conn
+        return existing is None
+    
+    def _index_upsert(self, summaries: List[Dict[str, Any]]) -> None:
+        """Insert or replace index rows."""
+        with self._index_conn:
+            self._index_conn.executemany(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                [tuple(summary[column] for column in INDEX_COLUMNS) for summary in summaries]
+            )
+    
+    def _index_replace_all(self, summaries: List[Dict[str, Any]]) -> None:
+        """Replace every index row in one transaction."""
+        with self._index_conn:
+            self._index_conn.execute("DELETE FROM sessions")
+            self._index_conn.executemany(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                [tuple(summary[column] for column in INDEX_COLUMNS) for summary in summaries]
+            )
+    
+    def _index_ids(self) -> Set[str]:
+        """Return the ids of every indexed session."""
+        return {row[0] for row in self._index_conn.execute("SELECT session_id FROM sessions")}
+    
+    def _index_delete(self, session_id: str) -> None:
+        """Remove an index row."""
+        with self._index_conn:
+            self._index_conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+    
+    def _index_select(self, limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Return index rows, most recently updated first."""
+        rows = self._index_conn.execute(
+            "SELECT session_id, title, created, updated, model, message_count "
+            "FROM sessions ORDER BY updated DESC LIMIT ?",
+            (limit or -1,)
+        ).fetchall()
+        return [dict(zip(INDEX_COLUMNS, row)) for row in rows]
+    
     async def delete_session(self, session_id: str) -> bool:
         """Delete a session."""
         try:
-            session_file = self.sessions_dir / f"{session_id}.json"
+            session_files = [
+                self._meta_path_fmt % session_id,
+                self._messages_path_fmt % session_id,
+                self._legacy_path_fmt % session_id
+            ]
+            
+            deleted = False
+            for session_file in session_files:
+                try:
+                    os.unlink(session_file)
+                    deleted = True
+                except FileNotFoundError:
+                    pass
             
-            if session_file.exists():
-                session_file.unlink()
+            if deleted:
                 logger.info(f"Deleted session: {session_id}")
+                
+                try:
+                    await self._ensure_index()
+                    await self._run_index(self._index_delete, session_id)
+                except Exception as e:
+                    self._index_dirty = True
+                    logger.warning(f"Failed to remove session {session_id} from index: {e}")
                 return True
             else:
                 return False
@@ -225,3 +527,11 @@ class StorageService:
         except Exception as e:
             logger.error(f"Failed to delete session {session_id}: {e}")
             return False
+    
+    async def close(self) -> None:
+        """Close the session index."""
+        if self._index_conn is not None:
+            await self._run_index(self._index_conn.close)
+            self._index_conn = None
+        self._index_ready = None
+        self._index_executor.shutdown(wait=False)
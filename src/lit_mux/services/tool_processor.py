@@ -71,7 +71,7 @@ class ToolCallProcessor:
         """
         Process a chat completion with tools support (exact lit-platform approach).
         """
-        logger.info(f"=== STARTING RECURSIVE TOOL PROCESSING (max tools: {max_iterations}) ===")
+        logger.info("=== STARTING RECURSIVE TOOL PROCESSING (max tools: %s) ===", max_iterations)
         
         # Store model for compatibility tracking
         self.current_model = model
@@ -82,13 +82,13 @@ class ToolCallProcessor:
         
         try:
             while self.tool_call_count < max_iterations:
-                logger.info(f"TOOL CYCLE #{self.tool_call_count + 1}: Starting stream processing")
+                logger.info("TOOL CYCLE #%s: Starting stream processing", self.tool_call_count + 1)
                 
                 # Reset state for this cycle
                 self._reset_state()
                 tool_executed_this_cycle = False
                 
-                logger.info(f"🚀 Calling Ollama")
+                logger.info("🚀 Calling Ollama")
                 
                 # Stream from the model (no tools parameter)
                 full_response = ""
@@ -149,10 +149,10 @@ class ToolCallProcessor:
                     break
                     
             if self.tool_call_count >= max_iterations:
-                logger.warning(f"Reached max tool calls ({max_iterations})")
+                logger.warning("Reached max tool calls (%s)", max_iterations)
                 
         except Exception as e:
-            logger.error(f"Error in tool processing: {e}")
+            logger.error("Error in tool processing: %s", e)
             if stream_callback:
                 error_msg = f"\n❌ Tool processing error: {e}\n"
                 # Handle both sync and async callbacks
@@ -170,7 +170,7 @@ class ToolCallProcessor:
         
         Copied from lit-lib approach.
         """
-        logger.debug(f"PROCESS TOKEN: '{token}' (state={self.state})")
+        logger.debug("PROCESS TOKEN: '%s' (state=%s)", token, self.state)
         
         if self.state == StreamState.NORMAL_TOKENS:
             return await self._handle_normal_token(token, stream_callback)
@@ -178,7 +178,7 @@ class ToolCallProcessor:
             return await self._handle_tool_collection_token(token, stream_callback)
         else:
             # Unknown state, treat as normal
-            logger.warning(f"Unknown state {self.state}, treating as normal")
+            logger.warning("Unknown state %s, treating as normal", self.state)
             self.state = StreamState.NORMAL_TOKENS
             return await self._handle_normal_token(token, stream_callback)
     
@@ -223,11 +223,11 @@ class ToolCallProcessor:
             elif char == "}":
                 self.brace_count -= 1
         
-        logger.debug(f"TOOL COLLECTION: '{token}' -> buffer='{self.tool_call_buffer}' brace_count={self.brace_count}")
+        logger.debug("TOOL COLLECTION: '%s' -> buffer='%s' brace_count=%s", token, self.tool_call_buffer, self.brace_count)
         
         # If braces are balanced, we might have a complete JSON object
         if self.brace_count == 0:
-            logger.info(f"TOOL VALIDATION: Balanced braces detected, validating JSON: '{self.tool_call_buffer}'")
+            logger.info("TOOL VALIDATION: Balanced braces detected, validating JSON: '%s'", self.tool_call_buffer)
             
             # Strip out <think>...</think> blocks before validation
             cleaned_buffer = re.sub(r'<think>.*?</think>', '', self.tool_call_buffer, flags=re.DOTALL).strip()
@@ -237,7 +237,7 @@ class ToolCallProcessor:
             
             if tool_call:
                 # Valid tool call detected
-                logger.info(f"TOOL EXECUTION #{self.tool_call_count + 1}: {tool_call['tool']}")
+                logger.info("TOOL EXECUTION #%s: %s", self.tool_call_count + 1, tool_call['tool'])
                 
                 # Execute the tool
                 try:
@@ -254,7 +254,7 @@ class ToolCallProcessor:
                     }
                     
                 except Exception as e:
-                    logger.error(f"Tool execution failed: {e}")
+                    logger.error("Tool execution failed: %s", e)
                     # Continue as normal text on error
                     self.state = StreamState.NORMAL_TOKENS
                     if stream_callback:
@@ -324,7 +324,7 @@ class ToolCallProcessor:
                     "arguments": arguments
                 }
         except Exception as e:
-            logger.error(f"Error extracting tool call: {e}")
+            logger.error("Error extracting tool call: %s", e)
         
         return None
     
@@ -338,12 +338,12 @@ class ToolCallProcessor:
         tool_name = tool_call["tool"]
         arguments = tool_call["arguments"]
         
-        logger.info(f"🚀 Executing {tool_name} on server {server_name} with args: {arguments}")
+        logger.info("🚀 Executing %s on server %s with args: %s", tool_name, server_name, arguments)
         
         try:
             # Execute the tool through MCP
             result = await self.mcp_client.execute_tool(server_name, tool_name, arguments)
-            logger.info(f"✅ Tool execution successful")
+            logger.info("✅ Tool execution successful")
             
             # Format the result
             if isinstance(result, dict):
@@ -17,11 +17,13 @@ class LitMuxClient:
     def __init__(self, base_url: str = "http://127.0.0.1:8000"):
         self.base_url = base_url
         self.session_id: Optional[str] = None
+        # Reuse keep-alive connections across requests
+        self.http = requests.Session()
     
     def health_check(self) -> bool:
         """Check if server is running."""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = self.http.get(f"{self.base_url}/health", timeout=5)
             if response.status_code == 200:
                 print("✅ lit-mux server is healthy")
                 return True
@@ -39,7 +41,7 @@ class LitMuxClient:
     def list_backends(self):
         """List available backends."""
         try:
-            response = requests.get(f"{self.base_url}/backends")
+            response = self.http.get(f"{self.base_url}/backends")
             if response.status_code == 200:
                 backends = response.json()
                 print("Available backends:")
@@ -58,7 +60,7 @@ class LitMuxClient:
         """Create a new session."""
         backends = backends or ["ollama"]
         try:
-            response = requests.post(f"{self.base_url}/sessions", json={
+            response = self.http.post(f"{self.base_url}/sessions", json={
                 "backends": backends,
                 "name": "Terminal Test Session"
             })
@@ -86,7 +88,7 @@ class LitMuxClient:
                 payload["backend"] = backend
             
             print(f"🤖 Sending: {message}")
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/sessions/{self.session_id}/message", 
                 json=payload
             )
@@ -109,7 +111,7 @@ class LitMuxClient:
     def list_sessions(self):
         """List all sessions."""
         try:
-            response = requests.get(f"{self.base_url}/sessions")
+            response = self.http.get(f"{self.base_url}/sessions")
             if response.status_code == 200:
                 sessions = response.json()
                 print(f"Found {len(sessions)} sessions:")
@@ -0,0 +1,40 @@
+"""
+Background descriptor sampling shared by the memory leak tests.
+"""
+
+import array
+import asyncio
+
+
+class FDWatermark:
+    """Sample the descriptor count in the background to catch transient spikes."""
+    
+    def __init__(self, sample, interval: float = 0.05):
+        self.sample = sample
+        self.interval = interval
+        self.samples = array.array('i')
+        self._handle = None
+    
+    def start(self) -> None:
+        """Take a sample now and every interval until stopped."""
+        self._tick()
+    
+    def _tick(self) -> None:
+        self.samples.append(self.sample())
+        self._handle = asyncio.get_running_loop().call_later(self.interval, self._tick)
+    
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+    
+    def summary(self) -> dict:
+        """Peak, minimum, and final-minus-initial descriptor counts."""
+        if not self.samples:
+            return {}
+        return {
+            "peak": max(self.samples),
+            "min": min(self.samples),
+            "change": self.samples[-1] - self.samples[0],
+        }
@@ -2,40 +2,77 @@
 """
 Stress test for lit-mux MCP server management.
 This simulates the problematic scenario that was causing "Too many open files".
+
+The server must have mcp.allow_runtime_servers enabled and an API key set;
+the key is read from LIT_MUX_API_KEY.
 """
 
 import asyncio
 import aiohttp
 import json
+import os
 import time
 import sys
 from datetime import datetime
 
+# Encode and decode request bodies with orjson when it is available
+try:
+    import orjson
+    
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+    
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
 
-async def add_mcp_server(session, server_config):
-    """Add an MCP server via API."""
-    try:
-        async with session.post(
-            "http://127.0.0.1:8000/mcp/servers",
-            json=server_config,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        ) as response:
-            result = await response.json()
-            return response.status == 200, result
-    except Exception as e:
-        return False, str(e)
+# Health fields the test reads; the server sends nothing else
+CYCLE_HEALTH_FIELDS = "servers_count"
+FINAL_HEALTH_FIELDS = "servers_count,total_tools,statistics,cleaned_up"
+
+# Cycle bodies are sent pre-encoded, so label them ourselves
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Upper bound on the whole run, including teardown of pooled connections
+RUN_TIMEOUT = 90
 
 
-async def remove_mcp_server(session, server_name):
-    """Remove an MCP server via API."""
+async def read_result(response):
+    """Return (ok, body), only decoding the body of successful responses."""
+    if response.status != 200:
+        # Drain the body so the connection goes back to the pool
+        await response.read()
+        return False, None
+    return True, await response.json(loads=json_loads)
+
+
+def servers_count(health):
+    """Active server count, from the compact report or a full one if the server ignored fields."""
+    if "servers_count" in health:
+        return health["servers_count"]
+    return len(health.get("servers", {}))
+
+
+def encode_cycle(server_configs):
+    """Encode the /mcp/cycle body once; it is the same for every cycle."""
+    ops = (
+        [{"add": config} for config in server_configs]
+        + [{"remove": config["name"]} for config in server_configs]
+        + [{"health": True, "fields": CYCLE_HEALTH_FIELDS}]
+    )
+    return json_dumps({"ops": ops}).encode()
+
+
+async def run_cycle(session, payload):
+    """Add, then remove, every server and report health, in one batched request."""
     try:
-        async with session.delete(
-            f"http://127.0.0.1:8000/mcp/servers/{server_name}",
-            timeout=10
+        async with session.post(
+            "http://127.0.0.1:8000/mcp/cycle",
+            data=payload,
+            headers=JSON_HEADERS
         ) as response:
-            result = await response.json()
-            return response.status == 200, result
+            return await read_result(response)
     except Exception as e:
         return False, str(e)
 
@@ -45,14 +82,89 @@ async def get_health(session):
     try:
         async with session.get(
             "http://127.0.0.1:8000/mcp/health",
-            timeout=10
+            params={"fields": FINAL_HEALTH_FIELDS}
         ) as response:
-            result = await response.json()
-            return response.status == 200, result
+            return await read_result(response)
     except Exception as e:
         return False, str(e)
 
 
+async def run_cycles(session, failing_configs):
+    """Run the add/remove cycles and print the final statistics."""
+    total_attempts = 0
+    total_failures = 0
+    
+    cycle_payload = encode_cycle(failing_configs)
+    
+    print(f"{'Cycle':<6} {'Time':<8} {'Server':<12} {'Add':<6} {'Remove':<8} {'Health'}")
+    print("-" * 60)
+    
+    for cycle in range(20):  # 20 cycles to simulate sustained load
+        cycle_start = time.monotonic()
+        
+        # One round trip per cycle; the server runs the ops in order, so each
+        # failed add is cleaned up before its remove (these should fail but not leak)
+        cycle_success, cycle_result = await run_cycle(session, cycle_payload)
+        count = len(failing_configs)
+        if cycle_success:
+            results = cycle_result["results"]
+            add_results = [result["success"] for result in results[:count]]
+            remove_results = [result["success"] for result in results[count:2 * count]]
+            health_servers = servers_count(results[-1]["health"])
+        else:
+            add_results = remove_results = [False] * count
+            health_servers = "?"
+        total_attempts += count
+        total_failures += add_results.count(False)
+        
+        # Display status in config order, one write per cycle
+        elapsed = time.monotonic() - cycle_start
+        rows = [
+            f"{cycle+1:<6} {elapsed:<8.2f} {config['name']:<12} "
+            f"{'✅' if add_success else '❌':<6} "
+            f"{'✅' if remove_success else '❌':<8} "
+            f"{health_servers}"
+            for config, add_success, remove_success in zip(
+                failing_configs, add_results, remove_results
+            )
+        ]
+        sys.stdout.write("\n".join(rows) + "\n")
+        sys.stdout.flush()
+    
+    # Get final health status; the endpoint reaps dead servers itself, so
+    # there is nothing to wait for first
+    health_success, health_result = await get_health(session)
+    
+    # One structured record for the whole run, written at once
+    lines = ["", "=" * 60, "📊 Final Statistics:"]
+    if health_success:
+        active_servers = servers_count(health_result)
+        summary = {
+            "attempts": total_attempts,
+            "failures": total_failures,
+            "success_rate": round((total_attempts - total_failures) / total_attempts * 100, 1),
+            "active_servers": active_servers,
+            "total_tools": health_result.get("total_tools", 0),
+            "statistics": health_result.get("statistics", {}),
+            "cleaned_up": health_result.get("cleaned_up", []),
+        }
+        lines.append(json.dumps(summary, indent=2))
+        
+        # Check for problems
+        if active_servers:
+            lines.append("⚠️ WARNING: Servers still active (possible leak)")
+        else:
+            lines.append("✅ No servers remaining (good cleanup)")
+    
+    lines += [
+        "",
+        "🏁 Stress test completed",
+        "   If lit-mux is still running without 'Too many open files',",
+        "   then the memory leak fix is working correctly!",
+    ]
+    print("\n".join(lines))
+
+
 async def stress_test_mcp_servers():
     """Stress test MCP server creation and removal."""
     print("🔥 Starting MCP server stress test")
@@ -81,81 +193,38 @@ async def stress_test_mcp_servers():
         }
     ]
     
-    total_attempts = 0
-    total_failures = 0
+    # One pooled, bounded connector for every request; the session-level
+    # timeout applies to each call, and enable_cleanup_closed aborts
+    # transports the server leaves half-closed
+    connector = aiohttp.TCPConnector(
+        limit=16,
+        limit_per_host=8,
+        ttl_dns_cache=300,
+        enable_cleanup_closed=True
+    )
+    timeout = aiohttp.ClientTimeout(total=10)
     
-    async with aiohttp.ClientSession() as session:
-        print(f"{'Cycle':<6} {'Time':<8} {'Server':<12} {'Add':<6} {'Remove':<8} {'Health'}")
-        print("-" * 60)
-        
-        for cycle in range(20):  # 20 cycles to simulate sustained load
-            cycle_start = time.time()
-            
-            for config in failing_configs:
-                server_name = config["name"]
-                
-                # Attempt to add server (this should fail but not leak)
-                add_success, add_result = await add_mcp_server(session, config)
-                total_attempts += 1
-                if not add_success:
-                    total_failures += 1
-                
-                # Brief pause
-                await asyncio.sleep(0.1)
-                
-                # Try to remove (cleanup)  
-                remove_success, remove_result = await remove_mcp_server(session, server_name)
-                
-                # Get health status
-                health_success, health_result = await get_health(session)
-                health_servers = len(health_result.get("servers", {})) if health_success else "?"
-                
-                # Display status
-                elapsed = time.time() - cycle_start
-                print(f"{cycle+1:<6} {elapsed:<8.2f} {server_name:<12} "
-                      f"{'✅' if add_success else '❌':<6} "
-                      f"{'✅' if remove_success else '❌':<8} "
-                      f"{health_servers}")
-                
-                # Small delay between servers
-                await asyncio.sleep(0.1)
-            
-            # Pause between cycles
-            await asyncio.sleep(0.5)
-        
-        print("\n" + "="*60)
-        print("📊 Final Statistics:")
-        
-        # Get final health status
-        health_success, health_result = await get_health(session)
-        if health_success:
-            servers = health_result.get("servers", {})
-            stats = health_result.get("statistics", {})
-            cleaned_up = health_result.get("cleaned_up", [])
-            
-            print(f"   Total server attempts: {total_attempts}")
-            print(f"   Failed attempts: {total_failures}")
-            print(f"   Success rate: {((total_attempts-total_failures)/total_attempts*100):.1f}%")
-            print(f"   Active servers: {len(servers)}")
-            print(f"   Total tools: {health_result.get('total_tools', 0)}")
-            
-            if stats:
-                print(f"   Servers created: {stats.get('servers_created', 0)}")
-                print(f"   Servers failed: {stats.get('servers_failed', 0)}")
-                print(f"   Servers removed: {stats.get('servers_removed', 0)}")
-            
-            if cleaned_up:
-                print(f"   Auto-cleaned servers: {cleaned_up}")
-            
-            # Check for problems
-            if len(servers) > 0:
-                print("   ⚠️ WARNING: Servers still active (possible leak)")
-            else:
-                print("   ✅ No servers remaining (good cleanup)")
-        
-        print("\n🏁 Stress test completed")
-        print("   If lit-mux is still running without 'Too many open files',")
-        print("   then the memory leak fix is working correctly!")
+    # A misbehaving server can leave connections that never drain, so bound
+    # the whole run and close the session ourselves rather than waiting in
+    # the context manager's exit
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        json_serialize=json_dumps,
+        headers={"X-API-Key": os.environ.get("LIT_MUX_API_KEY", "")}
+    )
+    try:
+        await asyncio.wait_for(
+            run_cycles(session, failing_configs),
+            timeout=RUN_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        print(f"\n⏰ Stress test did not finish within {RUN_TIMEOUT}s")
+        raise
+    finally:
+        await session.close()
+        # Let the connector's transport callbacks run before the loop closes
+        await asyncio.sleep(0)
 
 
 if __name__ == "__main__":
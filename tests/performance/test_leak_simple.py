@@ -5,6 +5,7 @@ This version imports only the MCP client directly without FastAPI dependencies.
 """
 
 import asyncio
+import ctypes
 import logging
 import sys
 import os
@@ -23,80 +24,121 @@ except ImportError as e:
     logger.error(f"Failed to import MCP client: {e}")
     sys.exit(1)
 
+# Shared helper next to this script (the script directory is on sys.path)
+from fd_watermark import FDWatermark
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+PID = os.getpid()
+FD_DIR = f'/proc/{PID}/fd'
+
+# macOS has no /proc; libproc reports the descriptor table in one call
+PROC_PIDLISTFDS = 1
+PROC_FDINFO_SIZE = 8  # struct proc_fdinfo: int32 fd + uint32 type
+try:
+    LIBPROC = ctypes.CDLL('/usr/lib/libproc.dylib') if sys.platform == 'darwin' else None
+except OSError:
+    LIBPROC = None
+
+# Test configuration for servers
+TEST_CONFIGS = (
+    MCPServerConfig(
+        name="test_echo",
+        command="/bin/echo", 
+        args=["test"],
+        timeout=2
+    ),
+    MCPServerConfig(
+        name="test_fail",
+        command="/bin/false",  # Will fail immediately
+        timeout=2
+    ),
+    MCPServerConfig(
+        name="test_python",
+        command="/usr/bin/python3",
+        args=["-c", "import sys; print('Hello from Python'); sys.exit(0)"],
+        timeout=2
+    )
+)
+
+# Upper bound on concurrent add/remove operations in test_concurrent_servers
+MAX_CONCURRENT_OPS = 8
+
+CONCURRENT_CONFIGS = tuple(
+    MCPServerConfig(f"concurrent_{i}", "/bin/echo", [f"server_{i}"], timeout=2)
+    for i in range(3)
+)
+
 
 def count_open_files():
     """Count open file descriptors for current process."""
+    try:
+        # Count entries without building a list; -1 for scandir's own descriptor
+        with os.scandir(FD_DIR) as entries:
+            return sum(1 for _ in entries) - 1
+    except FileNotFoundError:
+        pass
+    
+    # No /proc (macOS): ask libproc
+    if LIBPROC is not None:
+        # A NULL buffer returns the size needed (with slack); the second
+        # call returns the bytes actually filled
+        size = LIBPROC.proc_pidinfo(PID, PROC_PIDLISTFDS, 0, None, 0)
+        if size > 0:
+            buffer = ctypes.create_string_buffer(size)
+            size = LIBPROC.proc_pidinfo(PID, PROC_PIDLISTFDS, 0, buffer, size)
+            if size > 0:
+                return size // PROC_FDINFO_SIZE
+    
+    # Last resort: lsof
     try:
         import subprocess
-        result = subprocess.run(['lsof', '-p', str(os.getpid())], 
+        result = subprocess.run(['lsof', '-p', str(PID)], 
                               capture_output=True, text=True)
         return len(result.stdout.strip().split('\n')) - 1  # -1 for header
     except:
-        # Fallback method
-        try:
-            fd_dir = f'/proc/{os.getpid()}/fd'
-            return len(os.listdir(fd_dir))
-        except:
-            return -1
+        return -1
 
 
-async def test_mcp_server_lifecycle():
+async def test_mcp_server_lifecycle(client):
     """Test adding and removing MCP servers to check for leaks."""
     logger.info("Starting MCP server lifecycle test")
     
-    client = MCPClient()
-    
     # Get initial file descriptor count
     initial_fds = count_open_files()
     logger.info(f"Initial file descriptors: {initial_fds}")
     
-    # Test configuration for servers
-    test_configs = [
-        MCPServerConfig(
-            name="test_echo",
-            command="/bin/echo", 
-            args=["test"],
-            timeout=2
-        ),
-        MCPServerConfig(
-            name="test_fail",
-            command="/bin/false",  # Will fail immediately
-            timeout=2
-        ),
-        MCPServerConfig(
-            name="test_python",
-            command="/usr/bin/python3",
-            args=["-c", "import sys; print('Hello from Python'); sys.exit(0)"],
-            timeout=2
-        )
-    ]
+    # Watch for descriptor spikes between the per-cycle samples; without
+    # /proc or libproc each sample would fork lsof, so skip sampling then
+    watermark = FDWatermark(count_open_files)
+    if os.path.isdir(FD_DIR) or LIBPROC is not None:
+        watermark.start()
     
     # Test multiple cycles
     for cycle in range(5):
         logger.info(f"=== Cycle {cycle + 1}/5 ===")
         
-        for config in test_configs:
+        for config in TEST_CONFIGS:
             # Add server
             logger.info(f"Adding server: {config.name}")
             success = await client.add_server(config)
             logger.info(f"Server {config.name}: {'ADDED' if success else 'FAILED'}")
             
-            # Brief wait
-            await asyncio.sleep(0.2)
-            
-            # Check health
-            health = await client.health_check()
-            server_info = health.get("servers", {}).get(config.name, {})
-            logger.info(f"Server {config.name} status: {server_info}")
+            # Yield to the reader tasks; add_server has already finished
+            await asyncio.sleep(0)
             
             # Remove server
             logger.info(f"Removing server: {config.name}")
             removed = await client.remove_server(config.name)
             logger.info(f"Server {config.name}: {'REMOVED' if removed else 'REMOVE_FAILED'}")
         
+        # One health check per cycle; removed servers should be gone
+        health = await client.health_check()
+        servers = health.get("servers", {})
+        status = {config.name: servers.get(config.name) for config in TEST_CONFIGS}
+        logger.info(f"Server status after cycle {cycle + 1}: {status}")
+        
         # Check file descriptors after each cycle
         current_fds = count_open_files()
         logger.info(f"File descriptors after cycle {cycle + 1}: {current_fds} (diff: {current_fds - initial_fds})")
@@ -110,6 +152,9 @@ async def test_mcp_server_lifecycle():
     # Wait a bit for cleanup to complete
     await asyncio.sleep(1)
     
+    watermark.stop()
+    logger.info(f"Descriptor watermark: {watermark.summary()}")
+    
     # Final check
     final_fds = count_open_files()
     fd_diff = final_fds - initial_fds
@@ -130,22 +175,22 @@ async def test_mcp_server_lifecycle():
         return True
 
 
-async def test_concurrent_servers():
+async def test_concurrent_servers(client):
     """Test concurrent server operations."""
     logger.info("Testing concurrent server operations")
     
-    client = MCPClient()
     initial_fds = count_open_files()
     
-    # Create multiple servers concurrently
-    configs = [
-        MCPServerConfig(f"concurrent_{i}", "/bin/echo", [f"server_{i}"], timeout=2)
-        for i in range(3)
-    ]
+    # Bound concurrency so the pattern stays safe with more configs
+    sem = asyncio.Semaphore(MAX_CONCURRENT_OPS)
+    
+    async def guarded(coro):
+        async with sem:
+            return await coro
     
     # Add all servers concurrently
     logger.info("Adding servers concurrently...")
-    tasks = [client.add_server(config) for config in configs]
+    tasks = [guarded(client.add_server(config)) for config in CONCURRENT_CONFIGS]
     results = await asyncio.gather(*tasks, return_exceptions=True)
     
     for i, result in enumerate(results):
@@ -154,14 +199,15 @@ async def test_concurrent_servers():
         else:
             logger.info(f"Server {i}: {'SUCCESS' if result else 'FAILED'}")
     
-    # Check status
-    health = await client.health_check()
-    logger.info(f"Active servers: {len(health.get('servers', {}))}")
-    
-    # Remove all servers concurrently
+    # Check status while removing all servers concurrently
     logger.info("Removing servers concurrently...")
-    remove_tasks = [client.remove_server(f"concurrent_{i}") for i in range(3)]
-    await asyncio.gather(*remove_tasks, return_exceptions=True)
+    health_task = asyncio.create_task(client.health_check())
+    remove_tasks = [guarded(client.remove_server(config.name)) for config in CONCURRENT_CONFIGS]
+    health, *_ = await asyncio.gather(health_task, *remove_tasks, return_exceptions=True)
+    if isinstance(health, Exception):
+        logger.error(f"Health check failed: {health}")
+    else:
+        logger.info(f"Active servers: {len(health.get('servers', {}))}")
     
     await client.shutdown()
     
@@ -174,11 +220,13 @@ if __name__ == "__main__":
         logger.info("🧪 Starting lite memory leak tests")
         
         try:
-            # Test 1: Basic lifecycle
-            lifecycle_ok = await test_mcp_server_lifecycle()
-            
-            # Test 2: Concurrent operations
-            await test_concurrent_servers()
+            # One client for the whole run; each test shuts its servers down
+            async with MCPClient() as client:
+                # Test 1: Basic lifecycle
+                lifecycle_ok = await test_mcp_server_lifecycle(client)
+                
+                # Test 2: Concurrent operations
+                await test_concurrent_servers(client)
             
             if lifecycle_ok:
                 logger.info("✅ All tests PASSED - No significant memory leaks detected")